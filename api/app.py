@@ -1,10 +1,14 @@
-import os, json
+import os
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import Response, FileResponse
 
 DATA_DIR  = os.getenv("DATA_DIR", "data")
 JSON_PATH = os.getenv("JSON_PATH", os.path.join(DATA_DIR, "holdings_latest.json"))
+PARQUET_PATH = os.getenv("PARQUET_PATH", os.path.join(DATA_DIR, "holdings_latest.parquet"))
 
 app = FastAPI(title="Holdings API", version="0.1")
 
@@ -20,16 +24,41 @@ app.add_middleware(
 def health():
     return {"ok": True}
 
+# serialized /holdings body, rebuilt only when the file's mtime changes
+_CACHE = {"mtime": None, "body": b""}
+
 @app.get("/holdings")
 def holdings():
-    if not os.path.exists(JSON_PATH):
+    try:
+        st = os.stat(JSON_PATH)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"missing file: {JSON_PATH}")
-    # return parsed JSON so consumers get application/json with an array
-    with open(JSON_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    if not isinstance(data, list):
-        raise HTTPException(status_code=500, detail="holdings.json must be a JSON array")
-    return JSONResponse(data)
+    if st.st_mtime_ns != _CACHE["mtime"]:
+        with open(JSON_PATH, "rb") as f:
+            data = orjson.loads(f.read())
+        if not isinstance(data, list):
+            raise HTTPException(status_code=500, detail="holdings.json must be a JSON array")
+        _CACHE["body"] = orjson.dumps(data)
+        _CACHE["mtime"] = st.st_mtime_ns
+    return Response(content=_CACHE["body"], media_type="application/json")
+
+# Arrow IPC stream of the Parquet output, rebuilt only when its mtime changes
+_ARROW_CACHE = {"mtime": None, "body": b""}
+
+@app.get("/holdings.arrow")
+def holdings_arrow():
+    try:
+        st = os.stat(PARQUET_PATH)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"missing file: {PARQUET_PATH}")
+    if st.st_mtime_ns != _ARROW_CACHE["mtime"]:
+        table = pq.read_table(PARQUET_PATH)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        _ARROW_CACHE["body"] = sink.getvalue().to_pybytes()
+        _ARROW_CACHE["mtime"] = st.st_mtime_ns
+    return Response(content=_ARROW_CACHE["body"], media_type="application/vnd.apache.arrow.stream")
 
 # optional: raw file passthrough if you want it
 @app.get("/holdings.raw.json")
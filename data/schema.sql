@@ -13,6 +13,8 @@ CREATE TABLE IF NOT EXISTS holdings (
   extras TEXT
 );
 CREATE INDEX IF NOT EXISTS ix_holdings_fund_date ON holdings(fund_ticker, as_of_date);
+-- identity key used by the scraper's upsert (see scraper.main._ident_series)
+CREATE INDEX IF NOT EXISTS ix_holdings_key ON holdings(fund_ticker, as_of_date, COALESCE(cusip, isin, sedol, ticker||'|'||name));
 CREATE INDEX IF NOT EXISTS ix_holdings_ticker ON holdings(ticker);
 CREATE INDEX IF NOT EXISTS ix_holdings_cusip ON holdings(cusip);
 CREATE INDEX IF NOT EXISTS ix_holdings_isin ON holdings(isin);
@@ -2,68 +2,158 @@ import io
 import re
 import csv
 import pandas as pd
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree, html as lxhtml
 from typing import Optional, Dict
-from .utils import attach_extras
-import os, hashlib
+from .utils import pack_extras
+import os, hashlib, functools
 
 DEFAULT_HEADERS = {
     "User-Agent": "HoldingsScraper/0.1 (+research use)",
     "Accept": "*/*",
-    "Connection": "close",
 }
 
+# shared keep-alive session: reuses TCP/TLS connections across fetches
+_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=_RETRY))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=_RETRY))
+
+# set IVES_DEBUG=1 to print IVES parse diagnostics
+IVES_DEBUG = bool(os.getenv("IVES_DEBUG"))
+
 CACHE_DIR = ".http_cache"
 os.makedirs(CACHE_DIR, exist_ok=True)
 
+@functools.lru_cache(maxsize=4096)
 def _cache_path(url: str) -> str:
-    key = hashlib.sha256(url.encode()).hexdigest()
+    key = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
     return os.path.join(CACHE_DIR, key + ".bin")
 
+def _read_meta(meta_file: str) -> dict:
+    try:
+        with open(meta_file, "rb") as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return {}
+
 def fetch_url(url: str, headers: Optional[Dict[str, str]] = None, use_cache: bool = True) -> bytes:
+    """GET with an on-disk cache. Cached entries that carry an ETag or
+    Last-Modified validator are revalidated with a conditional GET; a 304
+    returns the cached bytes without re-downloading the body."""
     cache_file = _cache_path(url)
-    if use_cache and os.path.exists(cache_file):
-        with open(cache_file, "rb") as f:
-            return f.read()
+    meta_file = cache_file + ".meta"
 
     h = dict(DEFAULT_HEADERS)
     if headers:
         h.update(headers)
-    resp = requests.get(url, headers=h, timeout=30)
+
+    cached = None
+    if use_cache:
+        try:
+            with open(cache_file, "rb") as f:
+                cached = f.read()
+        except FileNotFoundError:
+            pass
+    if cached is not None:
+        meta = _read_meta(meta_file)
+        if not meta.get("etag") and not meta.get("last_modified"):
+            return cached
+        if meta.get("etag"):
+            h["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            h["If-Modified-Since"] = meta["last_modified"]
+
+    resp = _SESSION.get(url, headers=h, timeout=30)
+    if cached is not None and resp.status_code == 304:
+        return cached
     resp.raise_for_status()
     data = resp.content
 
     if use_cache:
         with open(cache_file, "wb") as f:
             f.write(data)
+        meta = {"etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified")}
+        with open(meta_file, "wb") as f:
+            f.write(orjson.dumps(meta))
     return data
 
+# one parser for every page; comments/PIs never reach the tree
+_HTML_PARSER = lxhtml.HTMLParser(remove_comments=True, remove_pis=True)
+
+def _parse_html(raw: bytes):
+    """Parse a page, dropping script/style bodies (bs4 get_text skipped them too)."""
+    doc = lxhtml.fromstring(raw, parser=_HTML_PARSER)
+    etree.strip_elements(doc, "script", "style", "template", with_tail=False)
+    return doc
+
+def _node_text(node, sep: str = "") -> str:
+    """lxml equivalent of bs4's get_text(sep, strip=True)."""
+    return sep.join(t for t in (s.strip() for s in node.itertext()) if t)
+
+def _select_one(root, css_selector: str):
+    found = root.cssselect(css_selector)
+    return found[0] if found else None
+
 def extract_text_with_selector(page_html: bytes, css_selector: str) -> Optional[str]:
     if not css_selector: return None
-    soup = BeautifulSoup(page_html, "lxml")
-    node = soup.select_one(css_selector)
-    if not node: return None
-    return node.get_text(strip=True)
+    node = _select_one(_parse_html(page_html), css_selector)
+    if node is None: return None
+    return _node_text(node)
+
+# -------- precompiled patterns --------
+_WS_RE = re.compile(r"\s+")
+_ASOF_PATTERNS = [re.compile(p, re.I) for p in (
+    r"as\s*of\s+([A-Za-z]{3,9}\s+\d{1,2},\s*\d{4})",  # As of September 24, 2025
+    r"as\s*of\s+(\d{1,2}-[A-Za-z]{3}-\d{4})",         # As of 24-Sep-2025
+    r"([A-Za-z]{3,9}\s+\d{1,2},\s*\d{4})",
+    r"(\d{1,2}-[A-Za-z]{3}-\d{4})",
+    r"(\d{4}-\d{2}-\d{2})",
+    r"(\d{1,2}/\d{1,2}/\d{4})",
+)]
+_IVES_DATE_PATTERNS = [re.compile(p, re.I) for p in (
+    r"([A-Za-z]+ \d{1,2}, \d{4})",   # September 24, 2025
+    r"(\d{1,2}/\d{1,2}/\d{4})",     # 09/24/2025
+    r"(\d{4}-\d{2}-\d{2})",         # 2025-09-24
+    r"(\d{1,2}-[A-Za-z]{3}-\d{4})",  # 24-Sep-2025
+)]
+_IVES_TICKER_RE = re.compile(r"ticker\s*symbol\s*[:,\-]\s*['\"]?([A-Z0-9.\-]+)['\"]?", re.I)
+_IVES_TICKER_VALUE_RE = re.compile(r"[A-Za-z0-9.\-]+")
+_IVES_JUNK_NAME_RE = re.compile(r"disclosure|notes?|important|information|summary", re.I)
+_IVES_JUNK_TICKER_RE = re.compile(r"disclosure|notes?|important|information|summary|as of|ticker\s*symbol", re.I)
 
 def parse_asof_from_text(text: Optional[str]) -> Optional[str]:
     if not text: return None
-    t = re.sub(r"\s+", " ", str(text).replace("\u00a0"," ")).strip()
-    patterns = [
-        r"as\s*of\s+([A-Za-z]{3,9}\s+\d{1,2},\s*\d{4})",  # As of September 24, 2025
-        r"as\s*of\s+(\d{1,2}-[A-Za-z]{3}-\d{4})",         # As of 24-Sep-2025
-        r"([A-Za-z]{3,9}\s+\d{1,2},\s*\d{4})",
-        r"(\d{1,2}-[A-Za-z]{3}-\d{4})",
-        r"(\d{4}-\d{2}-\d{2})",
-        r"(\d{1,2}/\d{1,2}/\d{4})",
-    ]
-    for pat in patterns:
-        m = re.search(pat, t, flags=re.I)
+    t = _WS_RE.sub(" ", str(text).replace("\u00a0"," ")).strip()
+    for pat in _ASOF_PATTERNS:
+        m = pat.search(t)
         if m:
             d = pd.to_datetime(m.group(1), errors="coerce")
             if pd.notna(d): return d.date().isoformat()
     return None
 
+# strip thousands separators / currency / percent signs in one C-level pass
+_NUM_STRIP = str.maketrans("", "", ",%$")
+
+def _to_num(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s.astype(str).str.translate(_NUM_STRIP), errors="coerce")
+
+def _read_csv(raw: bytes) -> pd.DataFrame:
+    """Parse CSV bytes: pyarrow engine first (multithreaded C++), then the
+    pandas C engine, then ';'-separated as a last resort."""
+    try:
+        return pd.read_csv(io.BytesIO(raw), engine="pyarrow")
+    except Exception:
+        pass
+    try:
+        return pd.read_csv(io.BytesIO(raw), encoding_errors="replace")
+    except Exception:
+        return pd.read_csv(io.BytesIO(raw), sep=";", encoding_errors="replace")
+
 DATE_COL_CANDIDATES = [
     "as_of_date","asofdate","effective_date","effectivedate",
     "date","report_date","reportdate"
@@ -79,26 +169,49 @@ def _infer_asof_from_df(df: pd.DataFrame) -> Optional[str]:
                     return d.date().isoformat()
     return None
 
+def _extract_asof(root, primary_sel: str) -> Optional[str]:
+    """As-of date from an already-parsed page: selector candidates first,
+    then the full page text."""
+    candidates = [primary_sel, "p.time-stamp.pt-3", "p.time-stamp", ".time-stamp"]
+    for sel in candidates:
+        if not sel: 
+            continue
+        node = _select_one(root, sel)
+        if node is not None:
+            txt = _node_text(node, " ")
+            dt = parse_asof_from_text(txt)
+            if dt: 
+                print(f"[GRNY] as-of via '{sel}': '{txt}' -> {dt}")
+                return dt
+    # fallback: search whole page for any date
+    txt = _node_text(root, " ")
+    dt = parse_asof_from_text(txt)
+    if dt: 
+        print(f"[GRNY] as-of via <full-page>: -> {dt}")
+    else:
+        print(f"[GRNY] as-of not found. Tried {candidates}")
+    return dt
+
 # -------- ETF via HTML table (e.g., GRNY) --------
 def etf_from_html_table(page_url: str,
                         fund_id: str,
                         table_selector: str = "table",
                         as_of_selector: str = "") -> pd.DataFrame:
     html = fetch_url(page_url)
-    soup = BeautifulSoup(html, "lxml")
-    table = soup.select_one(table_selector)
+    doc = _parse_html(html)
+    table = _select_one(doc, table_selector)
     if table is None:
         raise RuntimeError(f"Table not found: {table_selector}")
 
-    header_cells = table.select("thead th")
+    header_cells = table.cssselect("thead th")
     if not header_cells:
-        first_row = table.select_one("tr")
-        header_cells = first_row.select("td") if first_row else []
-    headers = [h.get_text(strip=True) for h in header_cells]
+        first_row = _select_one(table, "tr")
+        header_cells = first_row.cssselect("td") if first_row is not None else []
+    headers = [_node_text(h) for h in header_cells]
 
     rows = []
-    for tr in table.select("tbody tr"):
-        cells = [td.get_text(strip=True) for td in tr.select("td")]
+    for tr in table.cssselect("tbody tr"):
+        cells = [_node_text(td) for td in tr.cssselect("td")]
         if cells and len(cells) == len(headers):
             rows.append(dict(zip(headers, cells)))
     df = pd.DataFrame(rows)
@@ -118,55 +231,25 @@ def etf_from_html_table(page_url: str,
 
     for c in ["weight_pct","market_value_usd","shares"]:
         if c in df.columns:
-            df[c] = (df[c].astype(str)
-                           .str.replace(r"[,%$]", "", regex=True)
-                           .str.replace(",", "", regex=False))
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-
-    def _extract_asof(html_bytes, primary_sel: str):
-        s = BeautifulSoup(html_bytes, "lxml")
-        candidates = [primary_sel, "p.time-stamp.pt-3", "p.time-stamp", ".time-stamp"]
-        for sel in candidates:
-            if not sel: 
-                continue
-            node = s.select_one(sel)
-            if node:
-                txt = node.get_text(" ", strip=True)
-                dt = parse_asof_from_text(txt)
-                if dt: 
-                    print(f"[GRNY] as-of via '{sel}': '{txt}' -> {dt}")
-                    return dt
-        # fallback: sears = BeautifulSoup(html_bytes, "lxml")ch whole page for any date
-        txt = s.get_text(" ", strip=True)
-        dt = parse_asof_from_text(txt)
-        if dt: 
-            print(f"[GRNY] as-of via <full-page>: -> {dt}")
-        else:
-            print(f"[GRNY] as-of not found. Tried {candidates}")
-        return dt
-
-    # call it
-    as_of = _extract_asof(html, as_of_selector)
+            df[c] = _to_num(df[c])
+
+    # reuse the already-parsed document
+    as_of = _extract_asof(doc, as_of_selector)
 
     core = ["fund_ticker","as_of_date",
         "ticker","name","cusip","isin","sedol",
         "shares","weight_pct","market_value_usd"]
 
     # index-align with the parsed table
-    out = pd.DataFrame(index=df.index)
-    out["fund_ticker"] = fund_id
-    out["as_of_date"] = as_of if as_of else pd.NaT
-
+    cols = {"fund_ticker": fund_id, "as_of_date": as_of if as_of else pd.NaT}
     for c in core[2:]:
-        out[c] = df[c] if c in df.columns else pd.NA
+        cols[c] = df[c] if c in df.columns else pd.NA
+    out = pd.DataFrame(cols, index=df.index)
 
-    # extras
+    # extras: pack straight from the source columns; out is already core-ordered
     extra_cols = [c for c in df.columns if c not in out.columns]
-    merged = out.join(df[extra_cols]) if extra_cols else out
-
-    # pack + return only core + extras
-    merged = attach_extras(merged, keep_cols=core)
-    return merged[core + ["extras"]]
+    out["extras"] = pack_extras(df[extra_cols])
+    return out
 
 # -------- ETF via CSV (e.g., MPLY; generic) --------
 def etf_from_csv(csv_url: str,
@@ -175,10 +258,7 @@ def etf_from_csv(csv_url: str,
     if not csv_url:
         raise ValueError(f"No CSV URL for {fund_id}")
     raw = fetch_url(csv_url)
-    try:
-        df = pd.read_csv(io.BytesIO(raw))
-    except Exception:
-        df = pd.read_csv(io.BytesIO(raw), sep=";")
+    df = _read_csv(raw)
 
     # normalize headers
     df.columns = [str(c).strip().lower().replace('"', '').replace(" ", "_") for c in df.columns]
@@ -207,10 +287,7 @@ def etf_from_csv(csv_url: str,
     # numeric cleanup
     for c in ["weight_pct","market_value_usd","shares"]:
         if c in df.columns:
-            df[c] = (df[c].astype(str)
-                        .str.replace(r"[,%$]", "", regex=True)
-                        .str.replace(",", "", regex=False))
-            df[c] = pd.to_numeric(df[c], errors="coerce")
+            df[c] = _to_num(df[c])
 
     # infer as-of
     inferred = _infer_asof_from_df(df)
@@ -221,72 +298,53 @@ def etf_from_csv(csv_url: str,
             "ticker","name","cusip","isin","sedol",
             "shares","weight_pct","market_value_usd"]
 
-    out = pd.DataFrame(index=df.index)
-    out["fund_ticker"] = fund_id
-    out["as_of_date"] = as_of if as_of else pd.NaT
+    cols = {"fund_ticker": fund_id, "as_of_date": as_of if as_of else pd.NaT}
     for c in core[2:]:
-        out[c] = df[c] if c in df.columns else pd.NA
+        cols[c] = df[c] if c in df.columns else pd.NA
+    out = pd.DataFrame(cols, index=df.index)
 
     # extras after drops
     extra_cols = [c for c in df.columns if c not in out.columns]
-    merged = out.join(df[extra_cols]) if extra_cols else out
-
-    merged = attach_extras(merged, keep_cols=core)
-    return merged[core + ["extras"]]
+    out["extras"] = pack_extras(df[extra_cols])
+    return out
 
 
 # -------- IVES special-case CSV (odd preamble/headers) --------
 def etf_from_ives(csv_url: str, fund_id: str) -> pd.DataFrame:
     raw = fetch_url(csv_url)
-    text = raw.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
-    lines = [ln.lstrip("\ufeff") for ln in text.split("\n")]
+    raw = raw.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    if raw.startswith(b"\xef\xbb\xbf"):
+        raw = raw[3:]
 
     # --- robust header detection: skip "Ticker Symbol:,IVES" preamble lines ---
-    header_idx = None
-    for i, ln in enumerate(lines[:200]):
-        low = ln.lower()
-        cols = [c.strip() for c in ln.split(",")]
+    # scan raw bytes line by line; only the short preamble is ever decoded
+    header_off = None
+    idx = 0
+    for _ in range(200):
+        if idx >= len(raw):
+            break
+        nl = raw.find(b"\n", idx)
+        end = nl if nl != -1 else len(raw)
+        low = raw[idx:end].lower()
         # must look like a real table header: >=4 columns AND includes 'ticker' AND one of known fields
-        if ("ticker" in low) and len(cols) >= 4 and any(k in low for k in ["name","security","sedol","weight","market","shares"]):
-            # explicitly skip "ticker symbol" preamble
-            if "ticker symbol" in low and len(cols) < 4:
-                continue
-            header_idx = i
+        if b"ticker" in low and low.count(b",") >= 3 and any(
+            k in low for k in (b"name", b"security", b"sedol", b"weight", b"market", b"shares")
+        ):
+            header_off = idx
             break
-    if header_idx is None:
+        if nl == -1:
+            break
+        idx = nl + 1
+    if header_off is None:
         raise ValueError("IVES: header row not found")
-    
-    # Moved debug print after DataFrame is created
-
-    table_text = "\n".join(lines[header_idx:])
-    print(f"[IVES] About to read table_text (first 5 lines):")
-    for i, l in enumerate(table_text.splitlines()[:5]):
-        print(f"[IVES] table_text[{i}]: {l}")
-    try:
-        df = pd.read_csv(io.StringIO(table_text), skip_blank_lines=True, quotechar='"')
-    except Exception as e:
-        print(f"[IVES] pandas read_csv failed: {e}\nTrying with sep=';' ...")
-        try:
-            df = pd.read_csv(io.StringIO(table_text), sep=';', skip_blank_lines=True, quotechar='"')
-        except Exception as e2:
-            print(f"[IVES] pandas read_csv with sep=';' also failed: {e2}")
-            raise
-
-    print(f"[IVES] df.columns={list(df.columns)}")
-    print(f"[IVES] core_present={{k: (k in df.columns) for k in ['ticker','name','sedol','shares','market_value','weight']}}")
 
     # --- preamble above header: extract date and fund ticker ---
-    preamble = "\n".join(lines[:header_idx])
+    preamble = raw[:header_off].decode("utf-8", errors="replace")
 
     # as-of date
     as_of = None
-    for pat in [r"([A-Za-z]+ \d{1,2}, \d{4})",   # September 24, 2025
-        r"([A-Za-z]+ \d{1,2}, \d{4})",   # September 24, 2025
-        r"(\d{1,2}/\d{1,2}/\d{4})",     # 09/24/2025
-        r"(\d{4}-\d{2}-\d{2})",         # 2025-09-24
-        r"(\d{1,2}-[A-Za-z]{3}-\d{4})"  # 24-Sep-2025
-        ]:
-        m = re.search(pat, preamble, flags=re.I)
+    for pat in _IVES_DATE_PATTERNS:
+        m = pat.search(preamble)
         if m:
             d = pd.to_datetime(m.group(1), errors="coerce")
             if pd.notna(d):
@@ -295,38 +353,35 @@ def etf_from_ives(csv_url: str, fund_id: str) -> pd.DataFrame:
 
     # fund ticker from preamble; fallback to fund_id
     ft = None
-    m = re.search(r"ticker\s*symbol\s*[:,\-]\s*['\"]?([A-Z0-9.\-]+)['\"]?", preamble, flags=re.I)
+    m = _IVES_TICKER_RE.search(preamble)
     if m:
         ft = m.group(1).upper()
     else:
         # handle CSV-like "Ticker Symbol:,IVES"
-        for ln in lines[:header_idx]:
+        for ln in preamble.split("\n"):
             if "ticker" in ln.lower() and "symbol" in ln.lower():
                 parts = [p.strip().strip('"').strip("'") for p in ln.split(",") if p.strip()]
-                if len(parts) >= 2 and re.fullmatch(r"[A-Za-z0-9.\-]+", parts[-1]):
+                if len(parts) >= 2 and _IVES_TICKER_VALUE_RE.fullmatch(parts[-1]):
                     ft = parts[-1].upper()
                     break
     if not ft:
         ft = fund_id
 
 
-    table_text = "\n".join(lines[header_idx:])
+    table = raw[header_off:]
     try:
-        df = pd.read_csv(io.StringIO(table_text), skip_blank_lines=True, quotechar='"')
+        df = _read_csv(table)
     except Exception as e:
-        print(f"[IVES] pandas read_csv failed: {e}\nTrying with sep=';' ...")
-        try:
-            df = pd.read_csv(io.StringIO(table_text), sep=';', skip_blank_lines=True, quotechar='"')
-        except Exception as e2:
-            print(f"[IVES] pandas read_csv with sep=';' also failed: {e2}")
-            raise
+        print(f"[IVES] read_csv failed (pyarrow, C and sep=';'): {e}")
+        raise
 
-    print(f"[IVES] raw df shape={df.shape}")
+    if IVES_DEBUG:
+        print(f"[IVES] raw df shape={df.shape} columns={list(df.columns)}")
 
     if df.empty:
-        print("[IVES] DataFrame is empty after reading table_text. First 10 lines of table_text:")
-        for i, l in enumerate(table_text.splitlines()[:10]):
-            print(f"[IVES] table_text[{i}]: {l}")
+        print("[IVES] DataFrame is empty after reading the table. First 10 lines of the table:")
+        for i, l in enumerate(table.split(b"\n")[:10]):
+            print(f"[IVES] table[{i}]: {l.decode('utf-8', errors='replace')}")
         raise ValueError("IVES: empty table after header; aborting")
 
     # normalize headers
@@ -354,46 +409,39 @@ def etf_from_ives(csv_url: str, fund_id: str) -> pd.DataFrame:
     # remove footer/notes
     bad_rows = pd.Series(False, index=df.index)
     if "ticker" in df.columns:
-        bad_rows |= df["ticker"].str.match(r"(?i)disclosure|notes?|important|information|summary|as of|ticker\s*symbol")
+        bad_rows |= df["ticker"].str.match(_IVES_JUNK_TICKER_RE, na=False)
     if "name" in df.columns:
-        bad_rows |= df["name"].str.match(r"(?i)disclosure|notes?|important|information|summary")
+        bad_rows |= df["name"].str.match(_IVES_JUNK_NAME_RE, na=False)
     # rows with no portfolio data at all
-    numeric_all_na = True
-    for c in ["shares","weight_pct","market_value_usd"]:
-        if c in df.columns:
-            numeric_all_na = numeric_all_na & df[c].isna()
-    bad_rows |= numeric_all_na.fillna(False)
+    num_cols = [c for c in ("shares","weight_pct","market_value_usd") if c in df.columns]
+    if num_cols:
+        bad_rows |= df[num_cols].isna().all(axis=1)
 
     df = df[~bad_rows].reset_index(drop=True)
 
     # numeric cleanup
     for c in ["shares","market_value_usd","weight_pct"]:
         if c in df.columns:
-            df[c] = (
-                df[c].astype(str)
-                    .str.replace(r"[,$%]", "", regex=True)
-                    .str.replace(",", "", regex=False)
-            )
-            df[c] = pd.to_numeric(df[c], errors="coerce")
+            df[c] = _to_num(df[c])
 
     # --- normalized assembly with index alignment ---
     core = ["fund_ticker","as_of_date",
             "ticker","name","cusip","isin","sedol",
             "shares","weight_pct","market_value_usd"]
 
-    out = pd.DataFrame(index=df.index)
-    out["fund_ticker"] = ft  # not fund_id
-    out["as_of_date"] = as_of if as_of else pd.NaT
+    cols = {"fund_ticker": ft,  # not fund_id
+            "as_of_date": as_of if as_of else pd.NaT}
     for c in core[2:]:
-        out[c] = df[c] if c in df.columns else pd.NA
+        cols[c] = df[c] if c in df.columns else pd.NA
+    out = pd.DataFrame(cols, index=df.index)
 
     extra_cols = [c for c in df.columns if c not in out.columns]
-    merged = out.join(df[extra_cols]) if extra_cols else out
 
     # DEBUG: confirm core presence and row count
-    print(f"[IVES] rows={len(merged)} core_present="
-        f"{{k: (k in merged.columns) for k in {core}}}")
+    if IVES_DEBUG:
+        print(f"[IVES] rows={len(out)} core_present="
+              f"{ {k: (k in df.columns) for k in core} }")
 
-    merged = attach_extras(merged, keep_cols=core)
-    return merged[core + ["extras"]]
+    out["extras"] = pack_extras(df[extra_cols])
+    return out
 
@@ -1,15 +1,21 @@
+import io
 import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import numpy as np
 import pandas as pd
 from lxml import etree
 from typing import Optional, Dict, Any, Tuple
-import os, hashlib
+import os, hashlib, functools
 
 CACHE_DIR = ".http_cache"
 os.makedirs(CACHE_DIR, exist_ok=True)
 
+@functools.lru_cache(maxsize=4096)
 def _cache_path(url: str) -> str:
-    key = hashlib.sha256(url.encode()).hexdigest()
+    key = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
     return os.path.join(CACHE_DIR, key + ".bin")
 
 
@@ -17,9 +23,14 @@ def _cache_path(url: str) -> str:
 SEC_HEADERS = {
     "User-Agent": "HoldingsScraper/0.1 (+research use)",
     "Accept": "application/json, text/plain, */*",
-    "Connection": "close",
 }
 
+# keep-alive session: submissions, index.json and the info table XML all
+# live on SEC hosts, so later fetches skip the TCP/TLS handshake
+_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=_RETRY))
+
 def _cik_digits(cik: str) -> str:
     only = re.sub(r"\D", "", cik)
     return only.lstrip("0") or "0"
@@ -32,26 +43,19 @@ def _filing_dir_index_url(cik_digits: str, accession_nodash: str) -> str:
     return f"https://www.sec.gov/Archives/edgar/data/{cik_digits}/{accession_nodash}/index.json"
 
 def _fetch_json(url: str, use_cache: bool = True):
-    cf = _cache_path(url)
-    if use_cache and os.path.exists(cf):
-        import json
-        with open(cf, "rb") as f:
-            return json.loads(f.read().decode("utf-8", errors="replace"))
-    resp = requests.get(url, headers=SEC_HEADERS, timeout=30)
-    resp.raise_for_status()
-    data = resp.text
-    if use_cache:
-        with open(cf, "wb") as f:
-            f.write(data.encode("utf-8"))
-    import json
-    return json.loads(data)
+    # cache holds the raw response bytes; orjson parses them directly
+    # without a separate utf-8 decode step
+    return orjson.loads(_fetch_bytes(url, use_cache=use_cache))
 
 def _fetch_bytes(url: str, use_cache: bool = True) -> bytes:
     cf = _cache_path(url)
-    if use_cache and os.path.exists(cf):
-        with open(cf, "rb") as f:
-            return f.read()
-    resp = requests.get(url, headers=SEC_HEADERS, timeout=30)
+    if use_cache:
+        try:
+            with open(cf, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+    resp = _SESSION.get(url, headers=SEC_HEADERS, timeout=30)
     resp.raise_for_status()
     data = resp.content
     if use_cache:
@@ -95,26 +99,32 @@ def load_latest_13f_table(cik: str) -> Tuple[pd.DataFrame, str, str]:
 
     xml_url = f"https://www.sec.gov/Archives/edgar/data/{cik_digits}/{accession_nodash}/{xml_name}"
     xml_bytes = _fetch_bytes(xml_url)
-    root = etree.fromstring(xml_bytes)
-
-    rows = []
-    for it in root.findall(".//{*}infoTable") + root.findall(".//infoTable"):
-        def text(path):
-            node = it.find(path, namespaces=it.nsmap) if "{" in path else it.find(path)
-            return node.text.strip() if node is not None and node.text else None
-        name = text(".//{*}nameOfIssuer") or text("nameOfIssuer")
-        title = text(".//{*}titleOfClass") or text("titleOfClass")
-        cusip = text(".//{*}cusip") or text("cusip")
-        value = text(".//{*}value") or text("value")
-        shares = text(".//{*}shrsOrPrnAmt/{*}sshPrnamt") or text("shrsOrPrnAmt/sshPrnamt")
-        rows.append({
-            "name": name,
-            "title_of_class": title,
-            "cusip": cusip,
-            "market_value_usd": float(value) * 1000 if value and value.isdigit() else None,
-            "shares": int(shares) if shares and shares.isdigit() else None,
-        })
-    df = pd.DataFrame(rows)
+
+    # stream infoTable elements; {*} matches namespaced and bare tags alike
+    names, titles, cusips, values, shares = [], [], [], [], []
+    for _, it in etree.iterparse(io.BytesIO(xml_bytes), events=("end",), tag="{*}infoTable"):
+        d = {}
+        for el in it.iter(tag=etree.Element):
+            if el.text and el.text.strip():
+                d.setdefault(etree.QName(el).localname, el.text.strip())
+        value = d.get("value")
+        amt = d.get("sshPrnamt")
+        names.append(d.get("nameOfIssuer"))
+        titles.append(d.get("titleOfClass"))
+        cusips.append(d.get("cusip"))
+        values.append(float(value) if value and value.isdigit() else np.nan)
+        shares.append(int(amt) if amt and amt.isdigit() else None)
+        # drop processed rows so memory stays O(1 row)
+        it.clear()
+        while it.getprevious() is not None:
+            del it.getparent()[0]
+    df = pd.DataFrame({
+        "name": names,
+        "title_of_class": titles,
+        "cusip": cusips,
+        "market_value_usd": np.array(values, dtype=np.float64) * 1000,
+        "shares": pd.array(shares, dtype="Int64"),
+    })
     df["ticker"] = pd.NA
     df["weight_pct"] = pd.NA
     df["isin"] = pd.NA
@@ -2,53 +2,182 @@
 # Fully fixed, module-runnable, JSON/CSV/SQLite outputs, NaN-safe, schema autodetect.
 
 import argparse
+import functools
 import sys
 import os
 import sqlite3
+import zlib
 import yaml
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pandas writer fallback
+    pa = None
 
 from scraper.adapters import etf_from_csv, etf_from_html_table, etf_from_ives
 from scraper.edgar import load_latest_13f_table
-from scraper.utils import concat_and_order, finalize_types, attach_extras
+from scraper.utils import concat_and_order, finalize_types, pack_extras, records_json
+
+# Upper bound on managers fetched in parallel.
+MAX_FETCH_WORKERS = 10
+
+# Bulk-write settings for the holdings DB. WAL keeps readers (API/Streamlit)
+# unblocked; synchronous=NORMAL is crash-safe under WAL and skips most fsyncs.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-200000",
+)
 
 
 # ---------- helpers ----------
 
-def _s(v):
-    """Return trimmed string; turn None/NaN into ''."""
-    if v is None:
-        return ""
-    if isinstance(v, float) and pd.isna(v):
-        return ""
-    return str(v).strip()
+# holdings columns in INSERT order
+_DB_COLUMNS = (
+    "fund_ticker", "as_of_date", "ticker", "name", "cusip", "isin", "sedol",
+    "shares", "weight_pct", "market_value_usd", "extras",
+)
+_DB_NUMERIC = {"shares", "weight_pct", "market_value_usd"}
+
+def _text_col(s: pd.Series) -> list:
+    """Trimmed strings for SQLite params; None/NaN/NA/'' become None."""
+    t = s.astype("string").str.strip().fillna("")
+    return t.astype(object).where(t != "", None).tolist()
 
-def _nz(v):
-    """Return None for NaN, else the value (for SQLite)."""
-    return None if (isinstance(v, float) and pd.isna(v)) else v
+def _num_col(s: pd.Series) -> list:
+    """Numbers for SQLite params; NaN/NA become None."""
+    return s.astype(object).where(s.notna(), None).tolist()
 
-def _ident(row: pd.Series) -> str:
+def _ident_series(df: pd.DataFrame) -> pd.Series:
     """
-    Identity key: CUSIP → ISIN → SEDOL → ticker|name.
-    Uses raw keys if present; safe for NaNs.
+    Identity key per row: CUSIP → ISIN → SEDOL → ticker|name.
+    Vectorized; NaN/NA-safe.
     """
-    cusip  = _s(row.get("cusip"))
-    isin   = _s(row.get("isin"))
-    sedol  = _s(row.get("sedol"))
-    ticker = _s(row.get("ticker"))
-    name   = _s(row.get("name"))
-    return cusip or isin or sedol or f"{ticker}|{name}"
+    def col(c, rows=None):
+        s = df[c] if rows is None else df.loc[rows, c]
+        return s.fillna("").astype(str).str.strip()
+    key = col("cusip")
+    # each fallback is only cleaned for the rows still missing a key
+    for nxt in ("isin", "sedol", None):
+        miss = key == ""
+        if not miss.any():
+            break
+        key[miss] = col(nxt, miss) if nxt else col("ticker", miss) + "|" + col("name", miss)
+    return key
+
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@functools.lru_cache(maxsize=8)
+def _load_config(path: str, mtime_ns: int) -> dict:
+    """Parsed config, memoized per (path, mtime) for repeated run() calls. Treat as read-only."""
+    with open(path, "r") as fh:
+        return yaml.load(fh, Loader=_YAML_LOADER)
+
+@functools.lru_cache(maxsize=8)
+def _read_text(path: str, mtime_ns: int) -> str:
+    """File text, memoized per (path, mtime)."""
+    with open(path, "r") as fh:
+        return fh.read()
+
+def _write_csv(df: pd.DataFrame, path: str) -> None:
+    """CSV via Arrow's C++ writer; pandas for frames Arrow can't convert."""
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pa_csv.write_csv(table, path)
+            return
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            print(f"[WARN] Arrow CSV writer failed ({e}); using pandas", file=sys.stderr)
+    df.to_csv(path, index=False)
 
 def _choose_schema_path(explicit: str | None) -> str | None:
     """Pick schema file. Priority: explicit → data/schema.sql → data/schema.spl."""
     if explicit and os.path.exists(explicit):
         return explicit
-    cand = os.path.join("data", "schema.sql")
-    if os.path.exists(cand):
-        return cand
-    cand2 = os.path.join("data", "schema.spl")
-    if os.path.exists(cand2):
-        return cand2
+    # one directory read covers both candidates
+    try:
+        with os.scandir("data") as it:
+            names = {e.name for e in it if e.is_file()}
+    except FileNotFoundError:
+        return None
+    for name in ("schema.sql", "schema.spl"):
+        if name in names:
+            return os.path.join("data", name)
+    return None
+
+
+def _load_manager(m: dict) -> pd.DataFrame | None:
+    """Fetch + normalize one manager entry. Returns None on skip/error."""
+    typ = m.get("type")
+    mid = m.get("id")
+
+    if not typ or not mid:
+        print(f"[SKIP] invalid manager entry: {m}", file=sys.stderr)
+        return None
+
+    if typ == "etf_csv":
+        csv_url = m.get("csv_url") or ""
+        if not csv_url:
+            print(f"[SKIP] {mid}: csv_url not set", file=sys.stderr)
+            return None
+        try:
+            if mid.upper() == "IVES":
+                print("[DEBUG] etf_from_ives")
+                df = etf_from_ives(csv_url, mid)
+            else:
+                df = etf_from_csv(csv_url, mid)
+            print(f"[OK] {mid} rows={len(df)} (CSV)")
+            return df
+        except Exception as e:
+            print(f"[ERROR] {mid} etf_from_csv failed: {e}", file=sys.stderr)
+
+    elif typ == "etf_html_table":
+        page_url = m.get("page_url") or ""
+        if not page_url:
+            print(f"[SKIP] {mid}: page_url not set", file=sys.stderr)
+            return None
+        table_sel = (m.get("table_selector") or "table")
+        asof_sel = (m.get("asof_selector") or "")
+        try:
+            df = etf_from_html_table(page_url, mid, table_selector=table_sel, as_of_selector=asof_sel)
+            print(f"[OK] {mid} rows={len(df)} (HTML table)")
+            return df
+        except Exception as e:
+            print(f"[ERROR] {mid} etf_from_html_table failed: {e}", file=sys.stderr)
+
+    elif typ == "sec_13f":
+        cik = m.get("cik")
+        if not cik:
+            print(f"[SKIP] {mid}: cik not set", file=sys.stderr)
+            return None
+        try:
+            df13f, report_date, _ = load_latest_13f_table(cik)
+            core = [
+                "fund_ticker","as_of_date","ticker","name",
+                "cusip","isin","sedol","shares","weight_pct","market_value_usd"
+            ]
+
+            cols = {"fund_ticker": mid, "as_of_date": report_date}
+            for c in core[2:]:
+                cols[c] = df13f[c] if c in df13f.columns else pd.NA
+            out = pd.DataFrame(cols, index=df13f.index)
+
+            extra_cols = [c for c in df13f.columns if c not in out.columns]
+            out["extras"] = pack_extras(df13f[extra_cols])
+            print(f"[OK] {mid} rows={len(out)} (13F report_date={report_date})")
+            return out
+        except Exception as e:
+            print(f"[ERROR] {mid} 13F load failed: {e}", file=sys.stderr)
+
+    else:
+        print(f"[WARN] Unknown type {typ} for {mid}", file=sys.stderr)
+
     return None
 
 
@@ -61,156 +190,147 @@ def run(
     json_path: str = "data/holdings_latest.json",
     db_path: str = "data/holdings.db",
     schema_path: str | None = None,
+    use_processes: bool = False,
+    parquet_path: str | None = None,
 ) -> None:
     print("[DEBUG] scraper.main: start")
     os.makedirs("data", exist_ok=True)
 
-    with open(config_path, "r") as fh:
-        cfg = yaml.safe_load(fh)
+    cfg = _load_config(config_path, os.stat(config_path).st_mtime_ns)
 
+    managers = cfg.get("managers", [])
     out_frames: list[pd.DataFrame] = []
 
-    for m in cfg.get("managers", []):
-        typ = m.get("type")
-        mid = m.get("id")
-
-        if not typ or not mid:
-            print(f"[SKIP] invalid manager entry: {m}", file=sys.stderr)
-            continue
-
-        if typ == "etf_csv":
-            csv_url = m.get("csv_url") or ""
-            if not csv_url:
-                print(f"[SKIP] {mid}: csv_url not set", file=sys.stderr)
-                continue
-            try:
-                if mid.upper() == "IVES":
-                    print("[DEBUG] etf_from_ives")
-                    df = etf_from_ives(csv_url, mid)
-                else:
-                    df = etf_from_csv(csv_url, mid)
-                out_frames.append(df)
-                print(f"[OK] {mid} rows={len(df)} (CSV)")
-            except Exception as e:
-                print(f"[ERROR] {mid} etf_from_csv failed: {e}", file=sys.stderr)
-
-        elif typ == "etf_html_table":
-            page_url = m.get("page_url") or ""
-            if not page_url:
-                print(f"[SKIP] {mid}: page_url not set", file=sys.stderr)
-                continue
-            table_sel = (m.get("table_selector") or "table")
-            asof_sel = (m.get("asof_selector") or "")
-            try:
-                df = etf_from_html_table(page_url, mid, table_selector=table_sel, as_of_selector=asof_sel)
-                out_frames.append(df)
-                print(f"[OK] {mid} rows={len(df)} (HTML table)")
-            except Exception as e:
-                print(f"[ERROR] {mid} etf_from_html_table failed: {e}", file=sys.stderr)
-
-        elif typ == "sec_13f":
-            cik = m.get("cik")
-            if not cik:
-                print(f"[SKIP] {mid}: cik not set", file=sys.stderr)
-                continue
-            try:
-                df13f, report_date, _ = load_latest_13f_table(cik)
-                core = [
-                    "fund_ticker","as_of_date","ticker","name",
-                    "cusip","isin","sedol","shares","weight_pct","market_value_usd"
-                ]
-
-                out = pd.DataFrame(index=df13f.index)
-                out["fund_ticker"] = mid
-                out["as_of_date"] = report_date
-                for c in core[2:]:
-                    out[c] = df13f[c] if c in df13f.columns else pd.NA
-
-                extra_cols = [c for c in df13f.columns if c not in out.columns]
-                merged = out.join(df13f[extra_cols]) if extra_cols else out
-                merged = attach_extras(merged, keep_cols=core)
-                out_frames.append(merged[core + ["extras"]])
-                print(f"[OK] {mid} rows={len(merged)} (13F report_date={report_date})")
-            except Exception as e:
-                print(f"[ERROR] {mid} 13F load failed: {e}", file=sys.stderr)
-
+    # Managers are independent: fetch/parse them concurrently, but keep the
+    # output in config order. Threads overlap network waits; processes also
+    # spread the pandas/lxml parsing across cores (the HTTP cache is on disk,
+    # so workers share it).
+    if managers:
+        if use_processes:
+            pool = ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(managers)))
         else:
-            print(f"[WARN] Unknown type {typ} for {mid}", file=sys.stderr)
+            pool = ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(managers)))
+        with pool as ex:
+            futures = [ex.submit(_load_manager, m) for m in managers]
+            # a crash in one manager (or a dead worker process) only drops that manager
+            for m, fut in zip(managers, futures):
+                try:
+                    df = fut.result()
+                except Exception as e:
+                    print(f"[ERROR] {m.get('id')} worker failed: {e}", file=sys.stderr)
+                    continue
+                if df is not None:
+                    out_frames.append(df)
 
     # Concatenate and normalize
     final = concat_and_order(out_frames)
     final = finalize_types(final)
 
     # Write CSV (for audit/compat)
-    final.to_csv(out_path, index=False)
+    _write_csv(final, out_path)
     print(f"[DONE] wrote CSV: {len(final)} rows → {out_path}")
 
-    # Write JSON (for Streamlit/API)
-    final.to_json(json_path, orient="records")
+    # Write JSON (for Streamlit/API); new inode via rename, so hardlinked snapshots keep the old data
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(records_json(final))
+    os.replace(tmp_path, json_path)
     print(f"[DONE] wrote JSON: {json_path}")
 
+    # Write Parquet (columnar, compressed; served as Arrow by the API)
+    if parquet_path is None:
+        # Parquet twin sits next to the JSON, same rule the app uses to find it
+        parquet_path = os.path.splitext(json_path)[0] + ".parquet"
+    if parquet_path:
+        tmp_path = parquet_path + ".tmp"
+        final.to_parquet(tmp_path, engine="pyarrow", compression="zstd", index=False)
+        os.replace(tmp_path, parquet_path)
+        print(f"[DONE] wrote Parquet: {parquet_path}")
+
     # SQLite upsert (if schema exists)
     schema_to_use = _choose_schema_path(schema_path)
     if schema_to_use:
         with sqlite3.connect(db_path) as con:
-            con.executescript(open(schema_to_use, "r").read())
+            for pragma in SQLITE_PRAGMAS:
+                con.execute(f"PRAGMA {pragma}")
+            # DDL only when the schema text differs from what this DB last ran
+            ddl = _read_text(schema_to_use, os.stat(schema_to_use).st_mtime_ns)
+            ddl_crc = zlib.crc32(ddl.encode("utf-8")) & 0x7FFFFFFF
+            if con.execute("PRAGMA user_version").fetchone()[0] != ddl_crc:
+                con.executescript(ddl)
+                con.execute(f"PRAGMA user_version = {ddl_crc}")
             cur = con.cursor()
-
-            for _, r in final.iterrows():
-                k = (_s(r["fund_ticker"]), _s(r["as_of_date"]), _ident(r))
-                cur.execute(
-                    """
-                    DELETE FROM holdings
-                    WHERE fund_ticker=? AND as_of_date=?
-                      AND COALESCE(cusip, isin, sedol, ticker||'|'||name)=?
-                    """,
-                    k,
+            # whole upsert in one write transaction; `with con` commits it
+            cur.execute("BEGIN IMMEDIATE")
+
+            # bulk-load a TEMP staging table, then replace matching identities
+            # with two set-based statements; on duplicate identities the last
+            # row wins, as it did when rows were upserted one at a time
+            params = {
+                c: _num_col(final[c]) if c in _DB_NUMERIC else _text_col(final[c])
+                for c in _DB_COLUMNS
+            }
+            ident = _ident_series(final).tolist()
+            keys = pd.DataFrame({"f": params["fund_ticker"], "d": params["as_of_date"], "i": ident})
+            keep = ~keys.duplicated(keep="last").to_numpy()
+            rows = zip(ident, *(params[c] for c in _DB_COLUMNS))
+            if not keep.all():
+                rows = (r for r, k in zip(rows, keep) if k)
+            cur.execute("DROP TABLE IF EXISTS temp.holdings_stage")
+            cur.execute(
+                """
+                CREATE TEMP TABLE holdings_stage (
+                    k_ident TEXT,
+                    fund_ticker TEXT, as_of_date TEXT, ticker TEXT, name TEXT,
+                    cusip TEXT, isin TEXT, sedol TEXT,
+                    shares REAL, weight_pct REAL, market_value_usd REAL, extras TEXT
                 )
-                cur.execute(
-                    """
-                    INSERT INTO holdings (
-                        fund_ticker, as_of_date, ticker, name, cusip, isin, sedol,
-                        shares, weight_pct, market_value_usd, extras
-                    )
-                    VALUES (?,?,?,?,?,?,?,?,?,?,?)
-                    """,
-                    (
-                        _s(r.get("fund_ticker")) or None,
-                        _s(r.get("as_of_date")) or None,
-                        _s(r.get("ticker")) or None,
-                        _s(r.get("name")) or None,
-                        _s(r.get("cusip")) or None,
-                        _s(r.get("isin")) or None,
-                        _s(r.get("sedol")) or None,
-                        _nz(r.get("shares")),
-                        _nz(r.get("weight_pct")),
-                        _nz(r.get("market_value_usd")),
-                        _s(r.get("extras")) or None,
-                    ),
+                """
+            )
+            cur.executemany(
+                "INSERT INTO holdings_stage VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+                rows,
+            )
+            cur.execute(
+                """
+                DELETE FROM holdings
+                WHERE (fund_ticker, as_of_date) IN (SELECT s.fund_ticker, s.as_of_date FROM holdings_stage s)
+                  AND (fund_ticker, as_of_date, COALESCE(cusip, isin, sedol, ticker||'|'||name))
+                      IN (SELECT s.fund_ticker, s.as_of_date, s.k_ident FROM holdings_stage s)
+                """
+            )
+            cur.execute(
+                """
+                INSERT INTO holdings (
+                    fund_ticker, as_of_date, ticker, name, cusip, isin, sedol,
+                    shares, weight_pct, market_value_usd, extras
                 )
+                SELECT fund_ticker, as_of_date, ticker, name, cusip, isin, sedol,
+                       shares, weight_pct, market_value_usd, extras
+                FROM holdings_stage
+                """
+            )
+            cur.execute("DROP TABLE temp.holdings_stage")
         print(f"[DONE] upserted into SQLite: {db_path}")
     else:
         print("[WARN] No schema file found (data/schema.sql or data/schema.spl). Skipping SQLite write.", file=sys.stderr)
 
     # Optional diff if a previous CSV is provided
     if prev_path:
-        prev = pd.read_csv(prev_path)
+        # ids as text so CUSIPs keep their leading zeros
+        prev = pd.read_csv(prev_path, dtype={c: str for c in ("fund_ticker", "ticker", "name", "cusip", "isin", "sedol")})
         def key(df):
-            k1 = df["cusip"].fillna("")
-            k2 = df["isin"].fillna("")
-            k3 = df["sedol"].fillna("")
-            k4 = (df["ticker"].fillna("") + "|" + df["name"].fillna(""))
-            step = k1.where(k1 != "", k2)
-            step = step.where(step != "", k3)
-            return step.where(step != "", k4)
-
-        prev_keys = set((prev["fund_ticker"] + "::" + key(prev)))
-        curr_keys = set((final["fund_ticker"] + "::" + key(final)))
-        added = sorted(curr_keys - prev_keys)
-        removed = sorted(prev_keys - curr_keys)
+            k = df["fund_ticker"].fillna("").astype(str) + "::" + _ident_series(df)
+            return k.to_numpy(dtype=str)
+
+        prev_keys = key(prev)
+        curr_keys = key(final)
+        # sorted, de-duplicated set differences computed in NumPy
+        added = np.setdiff1d(curr_keys, prev_keys)
+        removed = np.setdiff1d(prev_keys, curr_keys)
         with open(out_path + ".diff.txt", "w") as f:
-            f.write("ADDED\n"); [f.write(a + "\n") for a in added]
-            f.write("\nREMOVED\n"); [f.write(r + "\n") for r in removed]
+            f.write("ADDED\n" + "".join(a + "\n" for a in added)
+                    + "\nREMOVED\n" + "".join(r + "\n" for r in removed))
         print(f"[DIFF] added={len(added)} removed={len(removed)} → {out_path}.diff.txt")
 
 
@@ -223,7 +343,9 @@ def main():
     ap.add_argument("--prev", default=None, help="Previous CSV for diffing")
     ap.add_argument("--json", default="data/holdings_latest.json", help="Output JSON path")
     ap.add_argument("--db", default="data/holdings.db", help="SQLite DB path")
+    ap.add_argument("--parquet", default=None, help="Output Parquet path (default: --json with .parquet; '' to skip)")
     ap.add_argument("--schema", default=None, help="Path to schema.sql/spl (optional)")
+    ap.add_argument("--processes", action="store_true", help="Parse managers in a process pool (many funds, CPU-bound)")
     args = ap.parse_args()
 
     run(
@@ -233,6 +355,8 @@ def main():
         json_path=args.json,
         db_path=args.db,
         schema_path=args.schema,
+        use_processes=args.processes,
+        parquet_path=args.parquet,
     )
 
 
@@ -1,7 +1,6 @@
-import json
 import re
+import orjson
 import pandas as pd
-import numpy as np
 
 STD_COLUMNS = [
     "fund_ticker","as_of_date",
@@ -9,39 +8,57 @@ STD_COLUMNS = [
     "shares","weight_pct","market_value_usd","extras"
 ]
 
-def _clean_id(x):
-    if pd.isna(x): return x
-    return re.sub(r"[\s\-]", "", str(x).upper())
+_ID_JUNK_RE = re.compile(r"[\s\-]")
 
-def _clean_ticker(x):
-    if pd.isna(x): return x
-    t = str(x).strip().upper()
-    return t if t else np.nan
+def _clean_ids(s: pd.Series) -> pd.Series:
+    return s.astype("string").str.upper().str.replace(_ID_JUNK_RE, "", regex=True)
+
+def _clean_tickers(s: pd.Series) -> pd.Series:
+    t = s.astype("string").str.strip().str.upper()
+    return t.mask(t == "", pd.NA)
+
+_NUMERIC_JUNK_RE = re.compile(r"[,$%]")
 
 def _to_numeric(s: pd.Series) -> pd.Series:
-    return (s.astype(str)
-             .str.replace(r"[,$%]", "", regex=True)
-             .str.replace(",", "", regex=False)
-             .pipe(pd.to_numeric, errors="coerce"))
-
-def attach_extras(df: pd.DataFrame, keep_cols) -> pd.DataFrame:
-    keep = set(keep_cols)
-    extra_cols = [c for c in df.columns if c not in keep]
-    if not extra_cols:
-        df["extras"] = "{}"
-        return df
-    payloads = []
-    for _, row in df.iterrows():
-        payload = {c: row[c] for c in extra_cols if pd.notna(row[c]) and str(row[c]) != ""}
-        payloads.append(json.dumps(payload, ensure_ascii=False))
-    df["extras"] = payloads
-    return df
+    # adapters usually hand over floats already; only text needs the strip pass
+    if not pd.api.types.is_numeric_dtype(s):
+        s = s.astype(str).str.replace(_NUMERIC_JUNK_RE, "", regex=True)
+    return pd.to_numeric(s, errors="coerce").astype("float64")
+
+def _dumps(obj) -> str:
+    # orjson handles numpy scalars natively; default=str covers Timestamps etc.
+    return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+
+def records_json(df: pd.DataFrame) -> bytes:
+    """orjson-encode `df` as a list of records (NaN/NA → null)."""
+    recs = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+    return orjson.dumps(recs, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+
+def pack_extras(extra: pd.DataFrame) -> list:
+    """JSON-pack each row of `extra` (non-empty values only), one string per row."""
+    if extra.shape[1] == 0:
+        return ["{}"] * len(extra)
+    # keep-masks computed per column in one pass; only object columns can hold ''
+    names = list(extra.columns)
+    arrays, masks = [], []
+    for c in names:
+        col = extra[c]
+        ok = col.notna()
+        if col.dtype == object or pd.api.types.is_string_dtype(col.dtype):
+            ok &= col.astype(str) != ""
+        arrays.append(col.to_numpy(dtype=object))
+        masks.append(ok.to_numpy())
+    # walk column arrays in lockstep instead of materializing a Series per row
+    return [
+        _dumps({c: v for c, v, k in zip(names, vals, oks) if k})
+        for vals, oks in zip(zip(*arrays), zip(*masks))
+    ]
 
 def finalize_types(df: pd.DataFrame) -> pd.DataFrame:
-    if "ticker" in df: df["ticker"] = df["ticker"].map(_clean_ticker)
-    if "fund_ticker" in df: df["fund_ticker"] = df["fund_ticker"].map(_clean_ticker)
+    if "ticker" in df: df["ticker"] = _clean_tickers(df["ticker"])
+    if "fund_ticker" in df: df["fund_ticker"] = _clean_tickers(df["fund_ticker"])
     for c in ["cusip","isin","sedol"]:
-        if c in df: df[c] = df[c].map(_clean_id)
+        if c in df: df[c] = _clean_ids(df[c])
     for c in ["shares","market_value_usd","weight_pct"]:
         if c in df: df[c] = _to_numeric(df[c])
     if "as_of_date" in df:
@@ -51,9 +68,6 @@ def finalize_types(df: pd.DataFrame) -> pd.DataFrame:
 def concat_and_order(dfs):
     if not dfs:
         return pd.DataFrame(columns=STD_COLUMNS)
-    cat = pd.concat(dfs, ignore_index=True)
-    for col in STD_COLUMNS:
-        if col not in cat.columns:
-            cat[col] = pd.NA
-    return cat[STD_COLUMNS]
+    # reindex adds any missing column (all-NaN) and orders them in one allocation
+    return pd.concat(dfs, ignore_index=True).reindex(columns=STD_COLUMNS)
 
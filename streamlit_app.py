@@ -1,9 +1,15 @@
 # streamlit_app.py
-# UI polished + modal diffs + safe number formatting (no sprintf patterns).
+# UI polished + modal diffs + client-side number formatting (column_config).
 
-import os, json, shutil, subprocess, sys
-from typing import Dict, Tuple, List
+import io, os, shutil, subprocess, sys, tempfile, threading
+from typing import Dict
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import streamlit as st
 
 # ------------------ CONFIG ------------------
@@ -31,7 +37,13 @@ DISPLAY_NAMES = {
     "country": "Country",
 }
 NUMERIC_COLS = ["shares", "weight_pct", "market_value_usd"]
+# narrower dtypes only where exact: integral share counts; weights and market values stay float64
+DOWNCAST = {"shares": "integer"}
+# repeated labels: integer codes; ticker/name substring search runs per category
+CATEGORY_COLS = ["fund_ticker", "sector", "country", "ticker", "name"]
+FILTER_COLS = ["fund_ticker", "sector"]
 DIFF_NUMERIC_COLS = ["shares", "weight_pct", "market_value_usd"]
+PAGE_ROWS = 1000  # main table rows sent to the browser per page
 
 # ------------------ PAGE + CSS ------------------
 st.set_page_config(page_title="Fund Holdings", layout="wide")
@@ -77,85 +89,201 @@ st.markdown(
 )
 
 # ------------------ LOADERS ------------------
-@st.cache_data(show_spinner=False)
-def load_json(path: str) -> pd.DataFrame:
+def _mtime(path: str) -> int:
+    return os.stat(path).st_mtime_ns
+
+def _parquet_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".parquet"
+
+def _parquet_sibling(path: str):
+    """The scraper's .parquet twin of `path`, if it is at least as new as the JSON."""
+    pq_path = _parquet_path(path)
+    try:
+        if os.stat(pq_path).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            return pq_path
+    except FileNotFoundError:
+        pass
+    return None
+
+def _write_parquet_twin(data: list, path: str) -> None:
+    """Best effort: save a JSON snapshot's records as its Parquet twin, so later loads
+    (and restarts) read it columnar instead of decoding the JSON again."""
+    pq_path = _parquet_path(path)
+    tmp_path = None
+    try:
+        # unique temp name: the scraper writes <twin>.tmp and may be mid-refresh
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(pq_path) or ".", prefix=os.path.basename(pq_path) + ".",
+            suffix=".tmp", delete=False,
+        ) as f:
+            tmp_path = f.name
+            pq.write_table(pa.Table.from_pylist(data), f, compression="zstd")
+        os.replace(tmp_path, pq_path)
+    except (OSError, pa.ArrowException) as e:
+        print(f"[WARN] could not cache {path} as Parquet ({e})", file=sys.stderr)
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+def load_json(path: str, mtime: int | None = None) -> pd.DataFrame:
+    """Frame for `path` at file version `mtime` (stat'ed when omitted). Cached helpers
+    pass the mtime from their own key, so the key always names the data it holds."""
     if not os.path.exists(path):
         raise FileNotFoundError(f"Missing file: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    if not isinstance(data, list):
-        raise ValueError("holdings_latest.json must be a JSON array")
-    df = pd.DataFrame(data)
-    keep = [c for c in SHOW_COLUMNS if c in df.columns]
-    df = df[keep].copy()
+    return _load_json_keyed(path, _mtime(path) if mtime is None else mtime)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _load_json_keyed(path: str, mtime: int) -> pd.DataFrame:
+    """Cached on (path, mtime): a refresh only invalidates the files it rewrote.
+    One shared frame per file version (no per-rerun copy), so treat it as read-only."""
+    # columnar read of just the shown columns when the Parquet twin is current
+    pq_path = _parquet_sibling(path)
+    if pq_path:
+        keep = [c for c in SHOW_COLUMNS if c in pq.read_schema(pq_path).names]
+        # label columns come back as categoricals straight from the Parquet dictionaries
+        cats = [c for c in CATEGORY_COLS if c in keep]
+        df = pq.read_table(pq_path, columns=keep, read_dictionary=cats).to_pandas(ignore_metadata=True)
+    else:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+        if not isinstance(data, list):
+            raise ValueError("holdings_latest.json must be a JSON array")
+        # the scraper writes uniform records, so the first one gives the schema;
+        # build only the shown columns instead of inferring every key
+        present = data[0].keys() if data else ()
+        df = pd.DataFrame({c: [r.get(c) for r in data] for c in SHOW_COLUMNS if c in present})
+        _write_parquet_twin(data, path)
     for c in NUMERIC_COLS:
         if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
+            df[c] = pd.to_numeric(df[c], errors="coerce", downcast=DOWNCAST.get(c))
+    # integral share counts with gaps: nullable ints (downcast gives up on NaN)
+    if "shares" in df.columns and df["shares"].dtype.kind == "f":
+        try:
+            df["shares"] = pd.to_numeric(df["shares"].astype("Int64"), downcast="integer")
+        except (TypeError, ValueError):
+            pass
+    for c in CATEGORY_COLS:
+        if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype("category")
     return df
 
-def _s(v):
-    if v is None: return ""
-    if isinstance(v, float) and pd.isna(v): return ""
-    return str(v).strip()
-
-def _ident(row: pd.Series) -> str:
-    cusip  = _s(row.get("cusip"))
-    isin   = _s(row.get("isin"))
-    sedol  = _s(row.get("sedol"))
-    ticker = _s(row.get("ticker"))
-    name   = _s(row.get("name"))
-    return cusip or isin or sedol or f"{ticker}|{name}"
-
-def _key_tuple(row: pd.Series) -> Tuple[str, str]:
-    fund = _s(row.get("fund_ticker") or row.get("Fund Ticker"))
-    raw = {
-        "cusip":  row.get("cusip"),
-        "isin":   row.get("isin"),
-        "sedol":  row.get("sedol"),
-        "ticker": row.get("ticker") or row.get("Ticker"),
-        "name":   row.get("name") or row.get("Security Name"),
-    }
-    return (fund, _ident(pd.Series(raw)))
-
-def _coerce_raw(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    ren = {}
-    if "Fund Ticker" in out.columns and "fund_ticker" not in out.columns: ren["Fund Ticker"] = "fund_ticker"
-    if "Security Name" in out.columns and "name" not in out.columns: ren["Security Name"] = "name"
-    if "Ticker" in out.columns and "ticker" not in out.columns: ren["Ticker"] = "ticker"
-    if "Portfolio Weight" in out.columns and "weight_pct" not in out.columns: ren["Portfolio Weight"] = "weight_pct"
-    if "Market Value (USD)" in out.columns and "market_value_usd" not in out.columns: ren["Market Value (USD)"] = "market_value_usd"
-    if ren: out = out.rename(columns=ren)
-    for c in DIFF_NUMERIC_COLS:
-        if c in out.columns:
-            out[c] = pd.to_numeric(out[c], errors="coerce")
-    return out
+@st.cache_resource(max_entries=2, show_spinner=False)
+def display_view(path: str, mtime: int) -> pd.DataFrame:
+    """load_json(path) renamed for display once per file version.
+    Shared across reruns, so callers must not mutate it."""
+    return load_json(path, mtime).rename(columns=DISPLAY_NAMES)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def filter_options(path: str, mtime: int) -> Dict[str, list]:
+    """Selectbox options per categorical column, built once per file version."""
+    df = load_json(path, mtime)
+    # Parquet dictionaries keep first-seen order, so sort here
+    return {c: ["(All)"] + sorted(df[c].cat.categories.tolist()) for c in FILTER_COLS if c in df.columns}
+
+def _contains(col: pd.Series, q: str) -> np.ndarray:
+    """Case-insensitive substring match on a categorical: one test per category,
+    mapped back through the codes (code -1, i.e. missing, picks the trailing False)."""
+    cats = pa.array(col.cat.categories.astype(str).to_numpy(dtype=object), type=pa.string())
+    # Arrow's utf8 kernel folds case itself; no lowered copy of the categories
+    hits = pc.match_substring(cats, q, ignore_case=True).to_numpy(zero_copy_only=False)
+    return np.append(hits, False)[col.cat.codes.to_numpy()]
+
+def _equals(col: pd.Series, value: str) -> np.ndarray:
+    """Exact match on a categorical as one integer compare against the value's code."""
+    try:
+        code = col.cat.categories.get_loc(value)
+    except KeyError:
+        return np.zeros(len(col), dtype=bool)
+    return col.cat.codes.to_numpy() == code
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def filter_and_summarize(path: str, mtime: int, fund: str, ticker_q: str, name_q: str, sector: str):
+    """Boolean row mask for the filter widgets plus the KPIs over those rows,
+    reused while the inputs and file are unchanged."""
+    df = load_json(path, mtime)
+    mask = np.ones(len(df), dtype=bool)
+    if "fund_ticker" in df.columns and fund != "(All)":
+        mask &= _equals(df["fund_ticker"], fund)
+    if ticker_q and "ticker" in df.columns:
+        mask &= _contains(df["ticker"], ticker_q)
+    if name_q and "name" in df.columns:
+        mask &= _contains(df["name"], name_q)
+    if "sector" in df.columns and sector != "(All)":
+        mask &= _equals(df["sector"], sector)
+
+    def values(col: str) -> np.ndarray:
+        # float columns after load: mask the raw array first, then widen only the kept rows
+        return df[col].to_numpy()[mask].astype("float64", copy=False)
+
+    kpis = {"rows": int(np.count_nonzero(mask))}
+    if "market_value_usd" in df.columns:
+        kpis["total_mv"] = float(np.nansum(values("market_value_usd")))
+    if "weight_pct" in df.columns:
+        w = values("weight_pct")
+        w = w[~np.isnan(w)]
+        kpis["avg_w"] = float(w.mean()) if w.size else float("nan")
+    return mask, kpis
+
+def _text(df: pd.DataFrame, c: str) -> pd.Series:
+    """Stripped strings, "" when missing; categoricals are stripped once per category."""
+    if c not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    col = df[c]
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        cats = col.cat.categories.astype(str).str.strip().to_numpy(dtype=object)
+        return pd.Series(np.append(cats, "")[col.cat.codes.to_numpy()], index=df.index)
+    return col.fillna("").astype(str).str.strip()
+
+def _keyed(df: pd.DataFrame) -> pd.DataFrame:
+    """Index rows by a flat "fund\x1fidentity" string; on duplicate keys the last row wins.
+    Identity: CUSIP → ISIN → SEDOL → ticker|name, built column-wise. One string per
+    row keeps the set ops on a single hashtable (no MultiIndex tuples)."""
+    ident = _text(df, "cusip")
+    for nxt in (_text(df, "isin"), _text(df, "sedol"), _text(df, "ticker") + "|" + _text(df, "name")):
+        ident = ident.where(ident != "", nxt)
+    key = (_text(df, "fund_ticker") + "\x1f" + ident).to_numpy(dtype=object)
+    out = df.set_axis(pd.Index(key, name="_key"), axis=0)
+    return out[~out.index.duplicated(keep="last")]
 
 def compute_diffs(new_df: pd.DataFrame, old_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
-    new_raw = _coerce_raw(new_df)
-    old_raw = _coerce_raw(old_df)
-
-    new_map = { _key_tuple(r): r for _, r in new_raw.iterrows() }
-    old_map = { _key_tuple(r): r for _, r in old_raw.iterrows() }
-
-    new_keys, old_keys = set(new_map), set(old_map)
-    added_df = pd.DataFrame([new_map[k] for k in sorted(new_keys - old_keys)]) if (new_keys - old_keys) else pd.DataFrame(columns=new_raw.columns)
-    removed_df = pd.DataFrame([old_map[k] for k in sorted(old_keys - new_keys)]) if (old_keys - new_keys) else pd.DataFrame(columns=old_raw.columns)
-
-    changed_records: List[Dict] = []
-    for k in (new_keys & old_keys):
-        nr, orow = new_map[k], old_map[k]
-        changed = False
-        rec = {"fund_ticker": nr.get("fund_ticker"), "ticker": nr.get("ticker"), "name": nr.get("name")}
-        for c in DIFF_NUMERIC_COLS:
-            nval = pd.to_numeric(nr.get(c), errors="coerce")
-            oval = pd.to_numeric(orow.get(c), errors="coerce")
-            if (pd.isna(nval) and pd.isna(oval)): continue
-            if (pd.isna(nval) != pd.isna(oval)) or float(nval or 0) != float(oval or 0):
-                changed = True
-                rec[f"{c}_old"] = oval; rec[f"{c}_new"] = nval; rec[f"{c}_delta"] = (nval or 0) - (oval or 0)
-        if changed: changed_records.append(rec)
-    changed_df = pd.DataFrame(changed_records)
+    # raw column names throughout; display names are applied to the results only
+    new_raw = _keyed(new_df)
+    old_raw = _keyed(old_df)
+
+    # hashtable set ops on the key index; difference() returns keys sorted
+    added_df = new_raw.loc[new_raw.index.difference(old_raw.index)].reset_index(drop=True)
+    removed_df = old_raw.loc[old_raw.index.difference(new_raw.index)].reset_index(drop=True)
+
+    # holdings present on both sides, aligned on the same keys
+    common = new_raw.index.intersection(old_raw.index).sort_values()
+    new_c, old_c = new_raw.loc[common], old_raw.loc[common]
+
+    def side(src, c):
+        if c not in src.columns:
+            return pd.Series(float("nan") if c in DIFF_NUMERIC_COLS else None, index=common)
+        return src[c]
+
+    def values(src, c):
+        col = side(src, c)
+        if not pd.api.types.is_numeric_dtype(col):  # load_json frames are numeric already
+            col = pd.to_numeric(col, errors="coerce")
+        return col.to_numpy(dtype="float64", na_value=np.nan)
+
+    changed_df = pd.DataFrame({c: side(new_c, c) for c in ("fund_ticker", "ticker", "name")}, index=common)
+    any_changed = np.zeros(len(common), dtype=bool)
+    for c in DIFF_NUMERIC_COLS:
+        nval, oval = values(new_c, c), values(old_c, c)
+        # NaN != NaN, so only "both missing" needs excluding
+        diff = (nval != oval) & ~(np.isnan(nval) & np.isnan(oval))
+        if not diff.any():
+            continue
+        any_changed |= diff
+        changed_df[f"{c}_old"] = np.where(diff, oval, np.nan)
+        changed_df[f"{c}_new"] = np.where(diff, nval, np.nan)
+        changed_df[f"{c}_delta"] = np.where(diff, nval - oval, np.nan)
+    changed_df = changed_df[any_changed].reset_index(drop=True)
 
     rename = DISPLAY_NAMES.copy()
     rename.update({
@@ -169,59 +297,69 @@ def compute_diffs(new_df: pd.DataFrame, old_df: pd.DataFrame) -> Dict[str, pd.Da
 
     return {"added": added_df, "removed": removed_df, "changed": changed_df}
 
+# on disk too, so a restarted app reopens the modal without re-diffing unchanged files
+@st.cache_data(persist="disk", max_entries=4, show_spinner=False)
+def diffs_between(path_new: str, path_prev: str, mtime_new: int, mtime_prev: int) -> Dict[str, pd.DataFrame]:
+    """compute_diffs for two snapshot files at the given file versions."""
+    return compute_diffs(load_json(path_new, mtime_new), load_json(path_prev, mtime_prev))
+
 # ------------------ DISPLAY HELPERS ------------------
+# deltas are signed; old/new as in the main table
+CHANGED_FORMATS = {
+    "Market Value USD (Δ)": "%+,.0f", "Market Value USD (old)": "%,.0f", "Market Value USD (new)": "%,.0f",
+    "Shares (Δ)": "%+,.0f", "Shares (old)": "%,.0f", "Shares (new)": "%,.0f",
+    "Portfolio Weight (Δ)": "%+.2f%%", "Portfolio Weight (old)": "%.2f%%", "Portfolio Weight (new)": "%.2f%%",
+}
+# green/red deltas need a per-cell Styler; past this many rows show the plain frame
+COLOR_MAX_ROWS = 2000
+
 def style_changed(df: pd.DataFrame):
-    fmt_map = {}
-    if "Market Value USD (Δ)" in df.columns: fmt_map["Market Value USD (Δ)"] = "{:+,.0f}"
-    if "Market Value USD (old)" in df.columns: fmt_map["Market Value USD (old)"] = "{:,.0f}"
-    if "Market Value USD (new)" in df.columns: fmt_map["Market Value USD (new)"] = "{:,.0f}"
-    if "Shares (Δ)" in df.columns: fmt_map["Shares (Δ)"] = "{:+,.0f}"
-    if "Shares (old)" in df.columns: fmt_map["Shares (old)"] = "{:,.0f}"
-    if "Shares (new)" in df.columns: fmt_map["Shares (new)"] = "{:,.0f}"
-    if "Portfolio Weight (Δ)" in df.columns: fmt_map["Portfolio Weight (Δ)"] = "{:+.2f}%"
-    if "Portfolio Weight (old)" in df.columns: fmt_map["Portfolio Weight (old)"] = "{:.2f}%"
-    if "Portfolio Weight (new)" in df.columns: fmt_map["Portfolio Weight (new)"] = "{:.2f}%"
-
-    def color_delta(v):
-        try:
-            if pd.isna(v): return ""
-            if float(v) > 0: return "color: #16a34a;"
-            if float(v) < 0: return "color: #dc2626;"
-        except Exception:
-            return ""
-        return ""
-
-    styler = df.style.format(fmt_map)
-    for col in [c for c in df.columns if "Δ" in c]:
-        styler = styler.applymap(color_delta, subset=[col])
-    return styler
-
-def prettify_numbers(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    if "Market Value (USD)" in out.columns:
-        out["Market Value (USD)"] = out["Market Value (USD)"].apply(
-            lambda x: f"${x:,.0f}" if pd.notna(x) else ""
-        )
-    if "Portfolio Weight" in out.columns:
-        out["Portfolio Weight"] = out["Portfolio Weight"].apply(
-            lambda x: f"{x:.2f}%" if pd.notna(x) else ""
-        )
-    if "Shares" in out.columns:
-        out["Shares"] = out["Shares"].apply(
-            lambda x: f"{x:,.0f}" if pd.notna(x) else ""
-        )
-    return out
+    delta_cols = [c for c in df.columns if "Δ" in c]
+    if not delta_cols or len(df) > COLOR_MAX_ROWS:
+        return df
+
+    def color_delta(col: pd.Series):
+        v = col.to_numpy(dtype="float64", na_value=np.nan)
+        return np.where(v > 0, "color: #16a34a;", np.where(v < 0, "color: #dc2626;", ""))
+
+    return df.style.apply(color_delta, subset=delta_cols, axis=0)
+
+def changed_columns(df: pd.DataFrame) -> dict:
+    return {c: st.column_config.NumberColumn(format=f) for c, f in CHANGED_FORMATS.items() if c in df.columns}
+
+# printf-style, applied by the browser; "," adds thousands separators
+DISPLAY_FORMATS = {
+    "Market Value (USD)": "$%,.0f",
+    "Portfolio Weight": "%.2f%%",
+    "Shares": "%,.0f",
+}
+
+def number_columns(df: pd.DataFrame) -> dict:
+    """column_config for st.dataframe: the client formats the numbers, so nothing is
+    rendered per cell in Python and the columns stay numeric (and sort numerically)."""
+    return {c: st.column_config.NumberColumn(format=f) for c, f in DISPLAY_FORMATS.items() if c in df.columns}
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def csv_bytes(_df: pd.DataFrame, key) -> bytes:
+    """CSV for the download button, serialized once per (data file, filters) key.
+    Written by Arrow's C++ CSV writer, same as the scraper's CSV output."""
+    buf = io.BytesIO()
+    try:
+        pa_csv.write_csv(pa.Table.from_pandas(_df, preserve_index=False), buf)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        buf = io.BytesIO()
+        _df.to_csv(buf, index=False)
+    return buf.getvalue()
 
 # ------------------ MODAL DIALOG FOR DIFFS ------------------
 @st.dialog("Changes Made", width="large")
 def show_diffs_modal():
     try:
-        current = load_json(DATA_PATH)
         if not os.path.exists(PREV_PATH):
             st.warning("No changes found.")
             return
-        previous = load_json(PREV_PATH)
-        diffs = compute_diffs(current, previous)
+        # cached per snapshot pair; the radio below reruns only this dialog
+        diffs = diffs_between(DATA_PATH, PREV_PATH, _mtime(DATA_PATH), _mtime(PREV_PATH))
 
         view = st.radio("View", ["Added", "Removed", "Changed"], horizontal=True, key="diffs_view_radio")
 
@@ -229,506 +367,167 @@ def show_diffs_modal():
             if diffs["added"].empty:
                 st.success("No new holdings added.")
             else:
-                st.dataframe(prettify_numbers(diffs["added"]), width='stretch', hide_index=True)
+                st.dataframe(diffs["added"], column_config=number_columns(diffs["added"]), width='stretch', hide_index=True)
 
         elif view == "Removed":
             if diffs["removed"].empty:
                 st.info("No holdings removed.")
             else:
-                st.dataframe(prettify_numbers(diffs["removed"]), width='stretch', hide_index=True)
+                st.dataframe(diffs["removed"], column_config=number_columns(diffs["removed"]), width='stretch', hide_index=True)
 
         else:
             if diffs["changed"].empty:
                 st.info("No changes in weight, shares, or market value.")
             else:
-                st.dataframe(style_changed(diffs["changed"]), width='stretch', hide_index=True)
+                st.dataframe(style_changed(diffs["changed"]), column_config=changed_columns(diffs["changed"]), width='stretch', hide_index=True)
     except Exception as e:
         st.error(str(e))
 
+# ------------------ SNAPSHOT ------------------
+def _snapshot(src: str, dst: str) -> None:
+    """Hardlink src as dst. The scraper replaces src with a new file, so dst keeps
+    the old contents; falls back to a copy where links aren't supported."""
+    try:
+        os.remove(dst)
+    except FileNotFoundError:
+        pass
+    if not os.path.exists(src):
+        return
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+# ------------------ BACKGROUND REFRESH ------------------
+def _start_scraper() -> None:
+    """Launch the scraper without blocking the script; a daemon thread collects its log."""
+    proc = subprocess.Popen(
+        SCRAPER_CMD, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
+    lines = []
+    def drain():
+        for line in proc.stdout:
+            lines.append(line)
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+    st.session_state["scrape"] = (proc, lines, reader)
+
+@st.fragment(run_every=1)
+def scrape_progress():
+    """Polls the running scraper once a second; reruns the whole app when it exits."""
+    job = st.session_state.get("scrape")
+    if job is None:
+        return
+    proc, lines, reader = job
+    if proc.poll() is None:
+        # not a `with` block: leaving one would mark the status complete
+        st.status("Refreshing fund data…", state="running").text("".join(lines))
+        return
+    reader.join()
+    del st.session_state["scrape"]
+    st.session_state["scrape_result"] = (proc.returncode, lines)
+    st.rerun()
+
 # ------------------ LOAD CURRENT ------------------
+# warms the cache the fragment reads from; stops early on a missing/bad file
 try:
-    df_raw = load_json(DATA_PATH)
+    load_json(DATA_PATH)
 except Exception as e:
     st.error(str(e)); st.stop()
 
 # ------------------ CONTROLS (single row) ------------------
 c1, c2, spacer = st.columns([1, 1, 6])
 with c1:
-    if st.button("Refresh Fund Data", key="btn_refresh"):
-        os.makedirs(os.path.dirname(PREV_PATH) or ".", exist_ok=True)
-        if os.path.exists(DATA_PATH):
-            shutil.copy2(DATA_PATH, PREV_PATH)
-        try:
-            subprocess.run(SCRAPER_CMD, check=True)
-            load_json.clear()
-            df_raw = load_json(DATA_PATH)
-            st.success("Refresh complete.")
-        except subprocess.CalledProcessError as e:
-            st.error(f"Scraper failed with exit code {e.returncode}")
-        except Exception as e:
-            st.error(str(e))
+    refresh = st.button("Refresh Fund Data", key="btn_refresh")
 
 with c2:
     if st.button("Show Changes", key="btn_changes"):
         show_diffs_modal()
 
-# ------------------ FILTERS (on RAW) ------------------
-with st.expander("Filters", expanded=False):
-    col1, col2, col3, col4 = st.columns(4)
-
-    fund = "(All)"
-    sector = "(All)"
-    if "fund_ticker" in df_raw.columns:
-        fund_opts = ["(All)"] + sorted(df_raw["fund_ticker"].dropna().astype(str).unique().tolist())
-        fund = col1.selectbox("Fund", fund_opts)
-
-    ticker_q = col2.text_input("Ticker contains", placeholder="e.g. AAPL")
-    name_q   = col3.text_input("Name contains", placeholder="Any part of security name")
-
-    if "sector" in df_raw.columns:
-        sector_opts = ["(All)"] + sorted(df_raw["sector"].dropna().astype(str).unique().tolist())
-        sector = col4.selectbox("Sector", sector_opts)
-
-mask = pd.Series(True, index=df_raw.index)
-if "fund_ticker" in df_raw.columns and fund != "(All)":
-    mask &= (df_raw["fund_ticker"].astype(str) == fund)
-if ticker_q and "ticker" in df_raw.columns:
-    mask &= df_raw["ticker"].astype(str).str.contains(ticker_q, case=False, na=False)
-if name_q and "name" in df_raw.columns:
-    mask &= df_raw["name"].astype(str).str.contains(name_q, case=False, na=False)
-if "sector" in df_raw.columns and sector != "(All)":
-    mask &= (df_raw["sector"].astype(str) == sector)
-
-subset_raw = df_raw[mask].copy()
-
-# ------------------ KPIs (from filtered RAW) ------------------
-k1, k2, k3 = st.columns(3)
-k1.metric("Rows", f"{len(subset_raw):,}")
-if "market_value_usd" in subset_raw.columns:
-    total_mv = pd.to_numeric(subset_raw["market_value_usd"], errors="coerce").fillna(0).sum()
-    k2.metric("Total Market Value", f"${int(total_mv):,}")
-if "weight_pct" in subset_raw.columns:
-    avg_w = pd.to_numeric(subset_raw["weight_pct"], errors="coerce").dropna().mean()
-    k3.metric("Avg Weight", f"{avg_w:.2f}%")
-
-# ------------------ TABLE ------------------
-display_df = subset_raw.rename(columns=DISPLAY_NAMES)
-st.dataframe(
-    prettify_numbers(display_df),
-    width='stretch',
-    hide_index=True,
-)
+if refresh and "scrape" not in st.session_state:
+    os.makedirs(os.path.dirname(PREV_PATH) or ".", exist_ok=True)
+    if os.path.exists(DATA_PATH):
+        _snapshot(DATA_PATH, PREV_PATH)
+        # keep the Parquet twin too, so the previous snapshot also skips JSON decoding
+        _snapshot(_parquet_path(DATA_PATH), _parquet_path(PREV_PATH))
+    try:
+        _start_scraper()
+    except Exception as e:
+        st.error(str(e))
 
-# ------------------ DOWNLOAD ------------------
-st.download_button(
-    "Download filtered CSV",
-    display_df.to_csv(index=False).encode("utf-8"),
-    file_name="holdings_filtered.csv",
-    mime="text/csv",
-    key="btn_download_csv",
-)
+# outcome of a finished refresh, shown once on the rerun it triggered
+result = st.session_state.pop("scrape_result", None)
+if result:
+    rc, lines = result
+    label = f"Scraper failed with exit code {rc}" if rc else "Refresh complete."
+    with st.status(label, state="error" if rc else "complete", expanded=bool(rc)):
+        st.text("".join(lines))
+
+# only mounted while a scrape runs, so idle sessions don't rerun it every second
+if "scrape" in st.session_state:
+    scrape_progress()
+
+# ------------------ FILTERS + TABLE ------------------
+@st.fragment
+def filters_and_table():
+    """Filter widgets rerun only this fragment; loading and the controls above stay put."""
+    # one file version for the whole pass: a background refresh may replace the JSON
+    # mid-run, and the mask, KPIs, view and download must all describe the same rows
+    mtime = _mtime(DATA_PATH)
+
+    # ------------------ FILTERS (on RAW) ------------------
+    with st.expander("Filters", expanded=False):
+        col1, col2, col3, col4 = st.columns(4)
+
+        fund = "(All)"
+        sector = "(All)"
+        options = filter_options(DATA_PATH, mtime)
+        if "fund_ticker" in options:
+            fund = col1.selectbox("Fund", options["fund_ticker"])
+
+        ticker_q = col2.text_input("Ticker contains", placeholder="e.g. AAPL")
+        name_q   = col3.text_input("Name contains", placeholder="Any part of security name")
+
+        if "sector" in options:
+            sector = col4.selectbox("Sector", options["sector"])
+
+    keep, kpis = filter_and_summarize(DATA_PATH, mtime, fund, ticker_q, name_q, sector)
+
+    # ------------------ KPIs (from filtered RAW) ------------------
+    k1, k2, k3 = st.columns(3)
+    k1.metric("Rows", f"{kpis['rows']:,}")
+    if "total_mv" in kpis:
+        k2.metric("Total Market Value", f"${int(kpis['total_mv']):,}")
+    if "avg_w" in kpis:
+        k3.metric("Avg Weight", f"{kpis['avg_w']:.2f}%")
+
+    # ------------------ TABLE ------------------
+    view = display_view(DATA_PATH, mtime)
+    # no filter active: hand over the cached frame itself instead of a masked copy
+    display_df = view if kpis["rows"] == len(view) else view[keep]
+    # only the current page goes over the websocket; the download keeps every row
+    n_pages = -(-len(display_df) // PAGE_ROWS) or 1
+    page = st.number_input("Page", min_value=1, max_value=n_pages, value=1) if n_pages > 1 else 1
+    start = (page - 1) * PAGE_ROWS
+    st.dataframe(
+        display_df.iloc[start:start + PAGE_ROWS],
+        column_config=number_columns(display_df),
+        width='stretch',
+        hide_index=True,
+    )
+    if n_pages > 1:
+        st.caption(f"Rows {start + 1:,}–{min(start + PAGE_ROWS, len(display_df)):,} of {len(display_df):,}")
+
+    # ------------------ DOWNLOAD ------------------
+    # a callable is only run when the button is clicked, off the script thread
+    csv_key = (mtime, fund, ticker_q, name_q, sector)
+    st.download_button(
+        "Download filtered CSV",
+        lambda: csv_bytes(display_df, csv_key),
+        file_name="holdings_filtered.csv",
+        mime="text/csv",
+        key="btn_download_csv",
+    )
 
-# # streamlit_app.py
-# # Full replacement: single-row controls, modal diff popup, filtered KPIs, pretty formatting.
-
-# import os, json, shutil, subprocess, sys
-# from typing import Dict, Tuple, List
-# import pandas as pd
-# import streamlit as st
-
-# # ------------------ CONFIG ------------------
-# DATA_PATH = os.getenv("DATA_PATH", "data/holdings_latest.json")
-# PREV_PATH = os.getenv("PREV_PATH", "data/holdings_prev.json")  # snapshot file
-# SCRAPER_CMD = [
-#     sys.executable, "-m", "scraper.main",
-#     "--config", os.getenv("SCRAPER_CONFIG", "config.yml"),
-#     "--out",    os.getenv("SCRAPER_OUT",    "data/holdings_latest.csv"),
-# ]
-
-# SHOW_COLUMNS = [
-#     "fund_ticker","as_of_date","ticker","name",
-#     "shares","weight_pct","market_value_usd","sector","country",
-# ]
-# DISPLAY_NAMES = {
-#     "fund_ticker": "Fund Ticker",
-#     "as_of_date": "As of",
-#     "ticker": "Ticker",
-#     "name": "Security Name",
-#     "shares": "Shares",
-#     "weight_pct": "Portfolio Weight",
-#     "market_value_usd": "Market Value (USD)",
-#     "sector": "Sector",
-#     "country": "Country",
-# }
-# NUMERIC_COLS = ["shares", "weight_pct", "market_value_usd"]
-# DIFF_NUMERIC_COLS = ["shares", "weight_pct", "market_value_usd"]
-
-# # ------------------ UI ------------------
-# st.set_page_config(page_title="ETF Holdings", layout="wide")
-# st.title("ETF Holdings")
-
-# # ------------------ LOADERS ------------------
-# @st.cache_data(show_spinner=False)
-# def load_json(path: str) -> pd.DataFrame:
-#     if not os.path.exists(path):
-#         raise FileNotFoundError(f"Missing file: {path}")
-#     with open(path, "r", encoding="utf-8") as f:
-#         data = json.load(f)
-#     if not isinstance(data, list):
-#         raise ValueError("holdings_latest.json must be a JSON array")
-#     df = pd.DataFrame(data)
-#     keep = [c for c in SHOW_COLUMNS if c in df.columns]
-#     df = df[keep].copy()
-#     for c in NUMERIC_COLS:
-#         if c in df.columns:
-#             df[c] = pd.to_numeric(df[c], errors="coerce")
-#     return df
-
-# def _s(v):
-#     if v is None: return ""
-#     if isinstance(v, float) and pd.isna(v): return ""
-#     return str(v).strip()
-
-# def _ident(row: pd.Series) -> str:
-#     cusip  = _s(row.get("cusip"))
-#     isin   = _s(row.get("isin"))
-#     sedol  = _s(row.get("sedol"))
-#     ticker = _s(row.get("ticker"))
-#     name   = _s(row.get("name"))
-#     return cusip or isin or sedol or f"{ticker}|{name}"
-
-# def _key_tuple(row: pd.Series) -> Tuple[str, str]:
-#     fund = _s(row.get("fund_ticker") or row.get("Fund Ticker"))
-#     raw = {
-#         "cusip":  row.get("cusip"),
-#         "isin":   row.get("isin"),
-#         "sedol":  row.get("sedol"),
-#         "ticker": row.get("ticker") or row.get("Ticker"),
-#         "name":   row.get("name") or row.get("Security Name"),
-#     }
-#     return (fund, _ident(pd.Series(raw)))
-
-# def _coerce_raw(df: pd.DataFrame) -> pd.DataFrame:
-#     out = df.copy()
-#     ren = {}
-#     if "Fund Ticker" in out.columns and "fund_ticker" not in out.columns: ren["Fund Ticker"] = "fund_ticker"
-#     if "Security Name" in out.columns and "name" not in out.columns: ren["Security Name"] = "name"
-#     if "Ticker" in out.columns and "ticker" not in out.columns: ren["Ticker"] = "ticker"
-#     if "Portfolio Weight" in out.columns and "weight_pct" not in out.columns: ren["Portfolio Weight"] = "weight_pct"
-#     if "Market Value (USD)" in out.columns and "market_value_usd" not in out.columns: ren["Market Value (USD)"] = "market_value_usd"
-#     if ren: out = out.rename(columns=ren)
-#     for c in DIFF_NUMERIC_COLS:
-#         if c in out.columns:
-#             out[c] = pd.to_numeric(out[c], errors="coerce")
-#     return out
-
-# def compute_diffs(new_df: pd.DataFrame, old_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
-#     new_raw = _coerce_raw(new_df)
-#     old_raw = _coerce_raw(old_df)
-
-#     new_map = { _key_tuple(r): r for _, r in new_raw.iterrows() }
-#     old_map = { _key_tuple(r): r for _, r in old_raw.iterrows() }
-
-#     new_keys, old_keys = set(new_map), set(old_map)
-#     added_df = pd.DataFrame([new_map[k] for k in sorted(new_keys - old_keys)]) if (new_keys - old_keys) else pd.DataFrame(columns=new_raw.columns)
-#     removed_df = pd.DataFrame([old_map[k] for k in sorted(old_keys - new_keys)]) if (old_keys - new_keys) else pd.DataFrame(columns=old_raw.columns)
-
-#     changed_records: List[Dict] = []
-#     for k in (new_keys & old_keys):
-#         nr, orow = new_map[k], old_map[k]
-#         changed = False
-#         rec = {"fund_ticker": nr.get("fund_ticker"), "ticker": nr.get("ticker"), "name": nr.get("name")}
-#         for c in DIFF_NUMERIC_COLS:
-#             nval = pd.to_numeric(nr.get(c), errors="coerce")
-#             oval = pd.to_numeric(orow.get(c), errors="coerce")
-#             if (pd.isna(nval) and pd.isna(oval)): continue
-#             if (pd.isna(nval) != pd.isna(oval)) or float(nval or 0) != float(oval or 0):
-#                 changed = True
-#                 rec[f"{c}_old"] = oval; rec[f"{c}_new"] = nval; rec[f"{c}_delta"] = (nval or 0) - (oval or 0)
-#         if changed: changed_records.append(rec)
-#     changed_df = pd.DataFrame(changed_records)
-
-#     rename = DISPLAY_NAMES.copy()
-#     rename.update({
-#         "weight_pct_old":"Portfolio Weight (old)","weight_pct_new":"Portfolio Weight (new)","weight_pct_delta":"Portfolio Weight (Δ)",
-#         "shares_old":"Shares (old)","shares_new":"Shares (new)","shares_delta":"Shares (Δ)",
-#         "market_value_usd_old":"Market Value USD (old)","market_value_usd_new":"Market Value USD (new)","market_value_usd_delta":"Market Value USD (Δ)",
-#     })
-#     added_df = added_df.rename(columns=DISPLAY_NAMES)
-#     removed_df = removed_df.rename(columns=DISPLAY_NAMES)
-#     changed_df = changed_df.rename(columns=rename)
-
-#     return {"added": added_df, "removed": removed_df, "changed": changed_df}
-
-# # ------------------ DISPLAY HELPERS ------------------
-# def format_display(df: pd.DataFrame) -> pd.DataFrame:
-#     out = df.copy()
-#     out = out.rename(columns=DISPLAY_NAMES)
-#     if "Market Value (USD)" in out.columns:
-#         out["Market Value (USD)"] = out["Market Value (USD)"].apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "")
-#     if "Portfolio Weight" in out.columns:
-#         out["Portfolio Weight"] = out["Portfolio Weight"].apply(lambda x: f"{x:.2f}%" if pd.notna(x) else "")
-#     if "Shares" in out.columns:
-#         out["Shares"] = out["Shares"].apply(lambda x: f"{x:,.0f}" if pd.notna(x) else "")
-#     return out
-
-# def style_changed(df: pd.DataFrame):
-#     fmt_map = {}
-#     if "Market Value USD (Δ)" in df.columns: fmt_map["Market Value USD (Δ)"] = "{:+,.0f}"
-#     if "Market Value USD (old)" in df.columns: fmt_map["Market Value USD (old)"] = "{:,.0f}"
-#     if "Market Value USD (new)" in df.columns: fmt_map["Market Value USD (new)"] = "{:,.0f}"
-#     if "Shares (Δ)" in df.columns: fmt_map["Shares (Δ)"] = "{:+,.0f}"
-#     if "Shares (old)" in df.columns: fmt_map["Shares (old)"] = "{:,.0f}"
-#     if "Shares (new)" in df.columns: fmt_map["Shares (new)"] = "{:,.0f}"
-#     if "Portfolio Weight (Δ)" in df.columns: fmt_map["Portfolio Weight (Δ)"] = "{:+.2f}%"
-#     if "Portfolio Weight (old)" in df.columns: fmt_map["Portfolio Weight (old)"] = "{:.2f}%"
-#     if "Portfolio Weight (new)" in df.columns: fmt_map["Portfolio Weight (new)"] = "{:.2f}%"
-
-#     def color_delta(v):
-#         try:
-#             if pd.isna(v): return ""
-#             if float(v) > 0: return "color: green;"
-#             if float(v) < 0: return "color: red;"
-#         except Exception:
-#             return ""
-#         return ""
-
-#     styler = df.style.format(fmt_map)
-#     for col in [c for c in df.columns if "Δ" in c]:
-#         styler = styler.applymap(color_delta, subset=[col])
-#     return styler
-
-# # ------------------ MODAL DIALOG FOR DIFFS ------------------
-# @st.dialog("Changes vs previous", width="large")
-# def show_diffs_modal():
-#     try:
-#         current = load_json(DATA_PATH)
-#         if not os.path.exists(PREV_PATH):
-#             st.warning("No previous snapshot found.")
-#             return
-#         previous = load_json(PREV_PATH)
-#         diffs = compute_diffs(current, previous)
-
-#         view = st.radio("View", ["Added", "Removed", "Changed"], horizontal=True, key="diffs_view_radio")
-
-#         if view == "Added":
-#             if diffs["added"].empty:
-#                 st.success("No new holdings added.")
-#             else:
-#                 st.dataframe(format_display(diffs["added"]), use_container_width=True, hide_index=True)
-
-#         elif view == "Removed":
-#             if diffs["removed"].empty:
-#                 st.info("No holdings removed.")
-#             else:
-#                 st.dataframe(format_display(diffs["removed"]), use_container_width=True, hide_index=True)
-
-#         else:
-#             if diffs["changed"].empty:
-#                 st.info("No changes in weight, shares, or market value.")
-#             else:
-#                 st.dataframe(style_changed(diffs["changed"]), use_container_width=True, hide_index=True)
-#     except Exception as e:
-#         st.error(str(e))
-
-# # ------------------ LOAD CURRENT ------------------
-# try:
-#     df_raw = load_json(DATA_PATH)
-# except Exception as e:
-#     st.error(str(e)); st.stop()
-
-# # ------------------ CONTROLS (single row) ------------------
-# c1, c2, spacer = st.columns([1, 1, 6])
-
-# with c1:
-#     if st.button("Refresh data (run scraper)", use_container_width=True, key="btn_refresh"):
-#         os.makedirs(os.path.dirname(PREV_PATH) or ".", exist_ok=True)
-#         if os.path.exists(DATA_PATH):
-#             shutil.copy2(DATA_PATH, PREV_PATH)
-#         try:
-#             subprocess.run(SCRAPER_CMD, check=True)
-#             load_json.clear()
-#             df_raw = load_json(DATA_PATH)
-#             st.success("Refresh complete.")
-#         except subprocess.CalledProcessError as e:
-#             st.error(f"Scraper failed with exit code {e.returncode}")
-#         except Exception as e:
-#             st.error(str(e))
-
-# with c2:
-#     if st.button("Show changes vs previous", use_container_width=True, key="btn_changes"):
-#         show_diffs_modal()  # open the modal immediately
-
-# # ------------------ FILTERS (on RAW) ------------------
-# with st.expander("Filters", expanded=False):
-#     col1, col2, col3, col4 = st.columns(4)
-
-#     fund = "(All)"
-#     sector = "(All)"
-#     if "fund_ticker" in df_raw.columns:
-#         fund_opts = ["(All)"] + sorted(df_raw["fund_ticker"].dropna().astype(str).unique().tolist())
-#         fund = col1.selectbox("Fund", fund_opts)
-
-#     ticker_q = col2.text_input("Ticker contains")
-#     name_q   = col3.text_input("Name contains")
-
-#     if "sector" in df_raw.columns:
-#         sector_opts = ["(All)"] + sorted(df_raw["sector"].dropna().astype(str).unique().tolist())
-#         sector = col4.selectbox("Sector", sector_opts)
-
-# mask = pd.Series(True, index=df_raw.index)
-# if "fund_ticker" in df_raw.columns and fund != "(All)":
-#     mask &= (df_raw["fund_ticker"].astype(str) == fund)
-# if ticker_q and "ticker" in df_raw.columns:
-#     mask &= df_raw["ticker"].astype(str).str.contains(ticker_q, case=False, na=False)
-# if name_q and "name" in df_raw.columns:
-#     mask &= df_raw["name"].astype(str).str.contains(name_q, case=False, na=False)
-# if "sector" in df_raw.columns and sector != "(All)":
-#     mask &= (df_raw["sector"].astype(str) == sector)
-
-# subset_raw = df_raw[mask].copy()
-
-# # ------------------ KPIs (from filtered RAW) ------------------
-# k1, k2, k3 = st.columns(3)
-# k1.metric("Rows", f"{len(subset_raw):,}")
-
-# if "market_value_usd" in subset_raw.columns:
-#     total_mv = pd.to_numeric(subset_raw["market_value_usd"], errors="coerce").fillna(0).sum()
-#     k2.metric("Total Market Value", f"${int(total_mv):,}")
-
-# if "weight_pct" in subset_raw.columns:
-#     avg_w = pd.to_numeric(subset_raw["weight_pct"], errors="coerce").dropna().mean()
-#     k3.metric("Avg Weight", f"{avg_w:.2f}%")
-
-# # ------------------ TABLE (pretty view of SAME filtered rows) ------------------
-# display_df = subset_raw.rename(columns=DISPLAY_NAMES)
-# st.dataframe(
-#     format_display(display_df),
-#     use_container_width=True,
-#     hide_index=True,
-# )
-
-# # ------------------ DOWNLOAD ------------------
-# st.download_button(
-#     "Download filtered CSV",
-#     display_df.to_csv(index=False).encode("utf-8"),
-#     file_name="holdings_filtered.csv",
-#     mime="text/csv",
-#     key="btn_download_csv",
-# )
-
-
-# import os, json
-# import pandas as pd
-# import streamlit as st
-
-# # --------- CONFIG ---------
-# DATA_PATH = os.getenv("DATA_PATH", "data/holdings_latest.json")
-
-# COLUMNS = [
-#     "fund_ticker",
-#     "as_of_date",
-#     "ticker",
-#     "name",
-#     "shares",
-#     "weight_pct",
-#     "market_value_usd",
-#     "sector",
-#     "country",
-# ]
-
-# HEADER = {
-#     "fund_ticker": "Fund Ticker",
-#     "as_of_date": "As of",
-#     "ticker": "Ticker",
-#     "name": "Security Name",
-#     "shares": "Shares",
-#     "weight_pct": "Portfolio Weight",
-#     "market_value_usd": "Market Value (USD)",
-#     "sector": "Sector",
-#     "country": "Country",
-# }
-
-# # --------- PAGE SETUP ---------
-# st.set_page_config(page_title="Different Fund Holdings", layout="wide")
-# st.title("Different Fund Holdings")
-
-# # --------- LOAD DATA ---------
-# @st.cache_data(show_spinner=False)
-# def load_data(path: str) -> pd.DataFrame:
-#     if not os.path.exists(path):
-#         raise FileNotFoundError(f"Missing file: {path}")
-#     with open(path, "r", encoding="utf-8") as f:
-#         data = json.load(f)
-#     if not isinstance(data, list):
-#         raise ValueError("holdings.json must be a JSON array of objects")
-#     df = pd.DataFrame(data)
-
-#     # Keep only selected columns (if present)
-#     keep = [c for c in COLUMNS if c in df.columns]
-#     df = df[keep].copy()
-
-#     # Types/format
-#     if "shares" in df.columns:
-#         df["shares"] = pd.to_numeric(df["shares"], errors="coerce")
-#     if "weight_pct" in df.columns:
-#         df["weight_pct"] = pd.to_numeric(df["weight_pct"], errors="coerce")
-#     if "market_value_usd" in df.columns:
-#         df["market_value_usd"] = pd.to_numeric(df["market_value_usd"], errors="coerce")
-
-#     # Pretty headers
-#     df = df.rename(columns=HEADER)
-#     return df
-
-# try:
-#     df = load_data(DATA_PATH)
-# except Exception as e:
-#     st.error(str(e))
-#     st.stop()
-
-# # --------- FILTERS ---------
-# with st.expander("Filters", expanded=False):
-#     col1, col2, col3, col4 = st.columns(4)
-#     fund = col1.selectbox("Fund", options=["(All)"] + sorted(df["Fund Ticker"].dropna().unique().tolist())) if "Fund Ticker" in df.columns else "(All)"
-#     ticker_q = col2.text_input("Ticker contains")
-#     name_q = col3.text_input("Name contains")
-#     sector = col4.selectbox("Sector", options=["(All)"] + sorted(df["Sector"].dropna().unique().tolist())) if "Sector" in df.columns else "(All)"
-
-# # apply filters
-# fdf = df.copy()
-# if "Fund Ticker" in fdf.columns and fund != "(All)":
-#     fdf = fdf[fdf["Fund Ticker"] == fund]
-# if ticker_q:
-#     if "Ticker" in fdf.columns:
-#         fdf = fdf[fdf["Ticker"].astype(str).str.contains(ticker_q, case=False, na=False)]
-# if name_q:
-#     if "Security Name" in fdf.columns:
-#         fdf = fdf[fdf["Security Name"].astype(str).str.contains(name_q, case=False, na=False)]
-# if "Sector" in fdf.columns and sector != "(All)":
-#     fdf = fdf[fdf["Sector"] == sector]
-
-# # --------- SUMMARY KPI ---------
-# k1, k2, k3 = st.columns(3)
-# with k1:
-#     st.metric("Rows", f"{len(fdf):,}")
-# with k2:
-#     if "Market Value (USD)" in fdf.columns:
-#         st.metric("Total Market Value", f"${int(fdf['Market Value (USD)'].fillna(0).sum()):,}")
-# with k3:
-#     if "Portfolio Weight" in fdf.columns:
-#         st.metric("Avg Weight", f"{fdf['Portfolio Weight'].fillna(0).mean():.2f}%")
-
-# # --------- TABLE ---------
-# st.dataframe(
-#     fdf,
-#     use_container_width=True,
-#     hide_index=True,
-# )
-
-# # --------- CSV DOWNLOAD ---------
-# st.download_button(
-#     label="Download filtered CSV",
-#     data=fdf.to_csv(index=False).encode("utf-8"),
-#     file_name="holdings_filtered.csv",
-#     mime="text/csv",
-# )
\ No newline at end of file
+filters_and_table()